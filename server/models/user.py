@@ -6,7 +6,7 @@ SQLAlchemy model for user authentication and profile.
 """
 
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text, func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -42,5 +42,11 @@ class User(Base):
     # Settings (JSON stored as text for simplicity)
     settings = Column(Text, default="{}")
 
+    # Case-insensitive lookups filter on lower(email) / lower(username)
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email)),
+        Index("ix_users_username_lower", func.lower(username)),
+    )
+
     def __repr__(self):
         return f"<User {self.username}>"
@@ -8,13 +8,13 @@ API endpoints for managing project assets (file/image uploads).
 import logging
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Optional, cast
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
-from ..services.asset_manager import get_asset_manager
+from ..services.asset_manager import ReadableStream, get_asset_manager
 
 # Import registry for project lookup
 import sys
@@ -97,10 +97,12 @@ async def upload_asset(
     manager = get_asset_manager(project_dir)
 
     try:
-        content = await file.read()
-        asset_info = manager.upload(
+        # Stream from the spooled upload in large chunks rather than
+        # reading the whole body into memory first. UploadFile.file is typed
+        # BinaryIO but is a SpooledTemporaryFile, which has readinto().
+        asset_info = manager.upload_stream(
             filename=file.filename,
-            content=content,
+            stream=cast(ReadableStream, file.file),
             overwrite=overwrite
         )
 
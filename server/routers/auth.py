@@ -17,6 +17,7 @@ from sqlalchemy.orm import Session
 
 from ..services.auth import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    MAX_PASSWORD_BYTES,
     authenticate_user,
     change_password,
     create_access_token,
@@ -51,7 +52,7 @@ class UserRegister(BaseModel):
     """Registration request."""
     email: EmailStr
     username: str = Field(..., min_length=3, max_length=50, pattern=r'^[a-zA-Z0-9_-]+$')
-    password: str = Field(..., min_length=8)
+    password: str = Field(..., min_length=8, max_length=MAX_PASSWORD_BYTES)
     full_name: str | None = None
 
 
@@ -94,7 +95,7 @@ class UserProfileUpdate(BaseModel):
 class PasswordChange(BaseModel):
     """Password change request."""
     current_password: str
-    new_password: str = Field(..., min_length=8)
+    new_password: str = Field(..., min_length=8, max_length=MAX_PASSWORD_BYTES)
 
 
 class MFASetupResponse(BaseModel):
@@ -209,14 +210,17 @@ async def register(data: UserRegister):
                 detail="Username already taken",
             )
 
-        # Create user
-        user = create_user(
-            db,
-            email=data.email,
-            username=data.username,
-            password=data.password,
-            full_name=data.full_name,
-        )
+        # Create user (max_length counts characters; the hash limit is in bytes)
+        try:
+            user = create_user(
+                db,
+                email=data.email,
+                username=data.username,
+                password=data.password,
+                full_name=data.full_name,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
         # Generate token
         access_token = create_access_token(
@@ -329,7 +333,10 @@ async def change_user_password(data: PasswordChange, user_id: int = Depends(get_
                 detail="Current password is incorrect",
             )
 
-        change_password(db, user, data.new_password)
+        try:
+            change_password(db, user, data.new_password)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         return {"success": True, "message": "Password changed successfully"}
     finally:
         db.close()
@@ -513,6 +513,11 @@ async def delete_project(name: str, delete_files: bool = False):
         import time
         import sqlite3
 
+        from ..services.assistant_database import dispose_engine
+
+        # Release the cached assistant database engine for this project
+        dispose_engine(project_dir)
+
         # Close any SQLite connections to databases in this project
         db_files = list(project_dir.glob("*.db"))
         for db_file in db_files:
@@ -553,6 +558,9 @@ async def delete_project(name: str, delete_files: bool = False):
     # Unregister from registry
     unregister_project(name)
 
+    from ..services.worktree_manager import remove_worktree_manager
+    remove_worktree_manager(project_dir)
+
     return {
         "success": True,
         "message": f"Project '{name}' deleted" + (" (files removed)" if delete_files else " (files preserved)")
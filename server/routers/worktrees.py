@@ -5,6 +5,7 @@ Git Worktrees Router
 API endpoints for managing git worktrees for parallel agents.
 """
 
+import asyncio
 import logging
 import re
 from pathlib import Path
@@ -123,6 +124,40 @@ async def list_worktrees(project_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{project_name}/worktrees/overview")
+async def get_worktrees_overview(project_name: str):
+    """
+    Get repository state, worktrees and per-agent status in one call.
+
+    Status lookups for every agent worktree run concurrently, so the UI
+    doesn't need a separate request per agent.
+    """
+    project_dir = get_project_dir(project_name)
+    manager = get_worktree_manager(project_dir)
+
+    try:
+        is_git_repo = manager.is_git_repo()
+        worktrees = await manager.list_worktrees() if is_git_repo else []
+
+        agent_ids = [wt["agent_id"] for wt in worktrees]
+        statuses = await asyncio.gather(
+            *(manager.get_worktree_status(agent_id) for agent_id in agent_ids)
+        )
+
+        return {
+            "is_git_repo": is_git_repo,
+            "worktrees": worktrees,
+            "statuses": {
+                agent_id: status
+                for agent_id, status in zip(agent_ids, statuses)
+                if status
+            },
+        }
+    except Exception as e:
+        logger.exception("Failed to get worktrees overview")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{project_name}/worktrees/{agent_id}")
 async def get_worktree_status(project_name: str, agent_id: str):
     """
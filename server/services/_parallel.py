@@ -0,0 +1,111 @@
+"""
+Parallel File Processing Helpers
+================================
+
+Shared by the code validator and the documentation generator: a pruned
+directory walk, and a chunked process-pool map that falls back to running
+in-process where a pool can't be used.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+S = TypeVar("S")
+
+
+def walk_files(
+    directory: str,
+    skip_dirs: frozenset[str],
+    select: Callable[[str], Optional[S]],
+) -> Iterator[tuple[str, S]]:
+    """
+    Yield (path, select(name)) for files under a directory that select accepts.
+
+    select gets each file name and returns None (or another falsy value) to
+    reject it. Files of each directory come before its subdirectories, as
+    with Path.rglob. Directories named in skip_dirs are pruned before
+    descending, and entries are classified from scandir data so rejected
+    entries cost no extra stat.
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            subdirs.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                selected = select(entry.name)
+                if selected:
+                    yield entry.path, selected
+    except OSError as e:
+        logger.warning(f"Could not list directory {directory}: {e}")
+        return
+
+    for subdir in subdirs:
+        yield from walk_files(subdir, skip_dirs, select)
+
+
+def pool_context():
+    """
+    Multiprocessing context for worker processes.
+
+    Forking lets workers inherit compiled patterns and other module state
+    instead of re-importing and rebuilding it. Forking a process that is
+    running other threads can deadlock the child, though, so workers then
+    start from a fork server instead (or the platform default).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    if 'forkserver' in methods:
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context()
+
+
+def map_chunks(
+    func: Callable[[list[T]], list[R]],
+    items: list[T],
+    chunk_size: int,
+) -> list[R]:
+    """
+    Apply func to items in chunks and return the results in item order.
+
+    func takes a list of items and returns one result per item; it must be
+    picklable (a module-level function or a partial of one). Chunks are
+    spread over a process pool when there is more than one chunk and more
+    than one CPU; otherwise, or if no pool can be started, func runs
+    in-process over all items.
+    """
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    workers = min(os.cpu_count() or 1, len(chunks))
+
+    if workers <= 1:
+        return func(items)
+
+    results: list[R] = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as executor:
+            for chunk_results in executor.map(func, chunks):
+                results.extend(chunk_results)
+    except (OSError, RuntimeError) as e:
+        # Process pools can be unavailable in restricted environments
+        # (BrokenProcessPool is a RuntimeError)
+        logger.warning(f"Process pool unavailable, running serially: {e}")
+        return func(items)
+
+    return results
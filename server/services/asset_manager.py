@@ -7,16 +7,52 @@ Provides upload, listing, and deletion of project assets.
 """
 
 import hashlib
+import io
 import logging
 import mimetypes
+import mmap
 import os
+import re
 import shutil
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, BinaryIO, Optional
+from typing import Any, Iterator, Optional, Protocol, Union
 
 logger = logging.getLogger(__name__)
 
+# A SHA-256 hex digest embedded in a filename (e.g. "logo.3f2a...9c.png")
+_EMBEDDED_HASH_RE = re.compile(r"(?<![0-9a-fA-F])[0-9a-fA-F]{64}(?![0-9a-fA-F])")
+
+# Process umask, read once at import (os.umask can only be read by setting it).
+# Uploads get the mode a plain open() would give them, not tempfile's 0600.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Characters replaced when sanitizing filenames (anything but alphanumeric, dash, underscore)
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w-]")
+
+
+class ReadableStream(Protocol):
+    """A binary stream upload_stream() can read from (files, BytesIO, spooled uploads)."""
+
+    def readinto(self, buffer: memoryview, /) -> Optional[int]: ...
+
+    def seekable(self) -> bool: ...
+
+    def tell(self) -> int: ...
+
+    def seek(self, offset: int, whence: int = ..., /) -> int: ...
+
+
+def _get_extension(filename: str) -> str:
+    """Get the lowercased extension of a filename, or "" if it has none."""
+    _, dot, ext = filename.rpartition(".")
+    return ext.lower() if dot else ""
+
 
 class AssetManager:
     """
@@ -52,13 +88,34 @@ class AssetManager:
     # Maximum file size (10 MB)
     MAX_FILE_SIZE = 10 * 1024 * 1024
 
-    def __init__(self, project_dir: Path):
+    # Chunk size used when streaming uploads to disk
+    CHUNK_SIZE = 256 * 1024
+
+    # Integrity hash constructors; all produce 256-bit digests
+    HASH_ALGORITHMS = {
+        "sha256": hashlib.sha256,
+        "blake2b": lambda: hashlib.blake2b(digest_size=32),
+    }
+
+    def __init__(self, project_dir: Path, hash_algo: str = "sha256"):
+        if hash_algo not in self.HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm '{hash_algo}'")
+
         self.project_dir = project_dir.resolve()
+        self.hash_algo = hash_algo
         self.assets_dir = self.project_dir / "assets"
+        self._assets_dir_str = str(self.assets_dir)
 
         # Ensure assets directory exists
         self.assets_dir.mkdir(parents=True, exist_ok=True)
 
+        # list_assets() result, keyed by the assets directory mtime and the
+        # number of changes made through this manager. The mtime alone misses
+        # a file rewritten in place, so every upload and delete bumps the count.
+        self._assets_cache: Optional[list[dict[str, Any]]] = None
+        self._assets_cache_key: Optional[tuple[int, int]] = None
+        self._assets_changes = 0
+
     def _validate_filename(self, filename: str) -> tuple[bool, str]:
         """
         Validate a filename for security.
@@ -75,12 +132,20 @@ class AssetManager:
             return False, "Invalid filename: path traversal not allowed"
 
         # Check extension
-        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        ext = _get_extension(filename)
         if ext not in self.ALLOWED_EXTENSIONS:
             return False, f"File type '{ext}' not allowed"
 
         return True, ""
 
+    def _guess_mime_type(self, filename: str) -> Optional[str]:
+        """Guess a MIME type, using the precomputed table for allowed extensions."""
+        ext = _get_extension(filename)
+        if ext in _EXTENSION_MIME_TYPES:
+            return _EXTENSION_MIME_TYPES[ext]
+        mime_type, _ = mimetypes.guess_type(filename)
+        return mime_type
+
     def _get_safe_filename(self, filename: str) -> str:
         """
         Generate a safe, unique filename.
@@ -94,14 +159,8 @@ class AssetManager:
         else:
             name, ext = filename, ""
 
-        # Sanitize name (keep alphanumeric, dash, underscore)
-        safe_name = "".join(
-            c if c.isalnum() or c in "-_" else "_"
-            for c in name
-        )
-
-        # Limit length
-        safe_name = safe_name[:50]
+        # Limit length, then sanitize name (keep alphanumeric, dash, underscore)
+        safe_name = _UNSAFE_FILENAME_CHARS_RE.sub("_", name[:50])
 
         if ext:
             return f"{safe_name}.{ext}"
@@ -111,7 +170,9 @@ class AssetManager:
         self,
         filename: str,
         content: bytes,
-        overwrite: bool = False
+        overwrite: bool = False,
+        trust_filename_hash: bool = False,
+        size_hint: Optional[int] = None
     ) -> dict[str, Any]:
         """
         Upload a file to the assets directory.
@@ -120,6 +181,10 @@ class AssetManager:
             filename: Original filename
             content: File content as bytes
             overwrite: Whether to overwrite existing file
+            trust_filename_hash: Report a SHA-256 digest embedded in the
+                filename instead of hashing the content
+            size_hint: Expected size in bytes; when given, the embedded
+                digest is only trusted if the content has exactly this size
 
         Returns:
             Asset info dictionary
@@ -127,20 +192,59 @@ class AssetManager:
         Raises:
             ValueError: If file validation fails
         """
-        # Validate filename
-        is_valid, error = self._validate_filename(filename)
-        if not is_valid:
-            raise ValueError(error)
+        # Check file size up front so oversized buffers are never written
+        self._check_size(len(content))
+
+        return self.upload_stream(
+            filename, io.BytesIO(content), overwrite, trust_filename_hash, size_hint
+        )
 
-        # Check file size
-        if len(content) > self.MAX_FILE_SIZE:
+    def _check_size(self, size: int) -> None:
+        """Raise ValueError if size exceeds MAX_FILE_SIZE."""
+        if size > self.MAX_FILE_SIZE:
             raise ValueError(
-                f"File too large: {len(content)} bytes "
+                f"File too large: {size} bytes "
                 f"(max: {self.MAX_FILE_SIZE} bytes)"
             )
 
+    def upload_stream(
+        self,
+        filename: str,
+        stream: ReadableStream,
+        overwrite: bool = False,
+        trust_filename_hash: bool = False,
+        size_hint: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        Upload a file from a stream.
+
+        The stream is written to a temporary file in the assets directory
+        and hashed in a single pass, so the full content never has to be
+        held in memory. The temporary file replaces the target only once
+        the upload succeeds, so a failed overwrite leaves the old asset.
+
+        Args:
+            filename: Original filename
+            stream: File stream
+            overwrite: Whether to overwrite existing file
+            trust_filename_hash: Report a SHA-256 digest embedded in the
+                filename instead of hashing the content
+            size_hint: Expected size in bytes; when given, the embedded
+                digest is only trusted if the content has exactly this size
+
+        Returns:
+            Asset info dictionary
+
+        Raises:
+            ValueError: If file validation fails
+        """
+        # Validate filename
+        is_valid, error = self._validate_filename(filename)
+        if not is_valid:
+            raise ValueError(error)
+
         # Check mime type
-        mime_type, _ = mimetypes.guess_type(filename)
+        mime_type = self._guess_mime_type(filename)
         if mime_type and mime_type not in self.ALLOWED_MIME_TYPES:
             raise ValueError(f"MIME type '{mime_type}' not allowed")
 
@@ -159,73 +263,126 @@ class AssetManager:
                 safe_filename = f"{safe_filename}_{timestamp}"
             file_path = self.assets_dir / safe_filename
 
-        # Write file
-        file_path.write_bytes(content)
-
-        # Calculate hash for integrity (SHA256 for security compliance)
-        file_hash = hashlib.sha256(content).hexdigest()
-
-        logger.info("Uploaded asset: %s (%d bytes)", safe_filename, len(content))
+        # Seekable streams (spooled uploads, BytesIO) are size-checked
+        # before anything is written
+        stream_size = None
+        if stream.seekable():
+            start = stream.tell()
+            stream_size = stream.seek(0, os.SEEK_END) - start
+            stream.seek(start)
+            self._check_size(stream_size)
+
+        # Callers that name files by content digest can skip the hash pass,
+        # provided the content has the size they expect (a size_hint can only
+        # be checked up front on seekable streams)
+        embedded_hash = None
+        if trust_filename_hash and (size_hint is None or size_hint == stream_size):
+            match = _EMBEDDED_HASH_RE.search(filename)
+            if match:
+                embedded_hash = match.group(0).lower()
+
+        # Write file and calculate hash for integrity (corruption detection,
+        # so the faster BLAKE2b may be configured instead of SHA-256).
+        # Reuse a single buffer so each chunk is hashed and written without a copy.
+        hasher = self.HASH_ALGORITHMS[self.hash_algo]() if embedded_hash is None else None
+        buffer = memoryview(bytearray(self.CHUNK_SIZE))
+        size = 0
+        # Chunks are already large, so write straight to the raw file
+        # rather than through a BufferedWriter.
+        tmp = tempfile.NamedTemporaryFile(
+            "wb", buffering=0, dir=self.assets_dir, prefix=".upload-", delete=False
+        )
+        try:
+            with tmp as f:
+                while n := stream.readinto(buffer):
+                    size += n
+                    self._check_size(size)
+                    chunk = buffer[:n]
+                    if hasher:
+                        hasher.update(chunk)
+                    while chunk:
+                        chunk = chunk[f.write(chunk):]
+            os.chmod(tmp.name, 0o666 & ~_UMASK)
+            os.replace(tmp.name, file_path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+        finally:
+            self._assets_changed()
+
+        file_hash = hasher.hexdigest() if hasher else embedded_hash
+
+        logger.info("Uploaded asset: %s (%d bytes)", safe_filename, size)
 
         return {
             "filename": safe_filename,
             "original_filename": filename,
             "path": str(file_path),
-            "size": len(content),
+            "size": size,
             "mime_type": mime_type,
             "hash": file_hash,
+            "hash_algo": self.hash_algo if hasher else "sha256",
             "uploaded_at": datetime.now().isoformat(),
         }
 
-    def upload_stream(
-        self,
-        filename: str,
-        stream: BinaryIO,
-        overwrite: bool = False
-    ) -> dict[str, Any]:
-        """
-        Upload a file from a stream.
-
-        Args:
-            filename: Original filename
-            stream: File stream
-            overwrite: Whether to overwrite existing file
-
-        Returns:
-            Asset info dictionary
-        """
-        content = stream.read()
-        return self.upload(filename, content, overwrite)
+    def _assets_changed(self) -> None:
+        """Invalidate the list_assets() cache after a change through this manager."""
+        self._assets_changes += 1
+        self._assets_cache = None
 
     def list_assets(self) -> list[dict[str, Any]]:
         """
         List all assets in the project.
 
+        The listing is cached until the assets directory changes or an
+        asset is uploaded or deleted through this manager.
+
         Returns:
             List of asset info dictionaries
         """
-        assets = []
-
-        if not self.assets_dir.exists():
-            return assets
+        try:
+            key = (self.assets_dir.stat().st_mtime_ns, self._assets_changes)
+        except FileNotFoundError:
+            return []
 
-        for file_path in self.assets_dir.iterdir():
-            if file_path.is_file():
-                stat = file_path.stat()
-                mime_type, _ = mimetypes.guess_type(file_path.name)
+        if self._assets_cache is not None and self._assets_cache_key == key:
+            return list(self._assets_cache)
 
-                assets.append({
-                    "filename": file_path.name,
-                    "path": str(file_path),
-                    "size": stat.st_size,
-                    "mime_type": mime_type,
-                    "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                })
+        # scandir reports the entry type from the directory read itself
+        with os.scandir(self.assets_dir) as entries:
+            # Dot-files are in-progress uploads (see upload_stream)
+            files = [
+                (entry, entry.stat()) for entry in entries
+                if entry.is_file() and not entry.name.startswith(".")
+            ]
 
-        # Sort by modification time (newest first)
-        assets.sort(key=lambda a: a["modified_at"], reverse=True)
+        # Sort by modification time (newest first) on the raw timestamp
+        files.sort(key=lambda item: item[1].st_mtime_ns, reverse=True)
 
-        return assets
+        assets = []
+        for entry, st in files:
+            mime_type = self._guess_mime_type(entry.name)
+            assets.append({
+                "filename": entry.name,
+                "path": entry.path,
+                "size": st.st_size,
+                "mime_type": mime_type,
+                "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
+            })
+
+        # An upload or delete that ran during the scan changed the count, so
+        # the key no longer matches and this listing is never served
+        self._assets_cache = assets
+        self._assets_cache_key = key
+        return list(assets)
+
+    def _stat_asset(self, filename: str) -> Optional[os.stat_result]:
+        """Stat an asset with a single syscall; None unless it is a regular file."""
+        try:
+            st = os.stat(os.path.join(self._assets_dir_str, filename))
+        except OSError:
+            return None
+        return st if stat.S_ISREG(st.st_mode) else None
 
     def get_asset(self, filename: str) -> Optional[dict[str, Any]]:
         """
@@ -242,20 +399,18 @@ class AssetManager:
         if not is_valid:
             return None
 
-        file_path = self.assets_dir / filename
-
-        if not file_path.exists() or not file_path.is_file():
+        st = self._stat_asset(filename)
+        if st is None:
             return None
 
-        stat = file_path.stat()
-        mime_type, _ = mimetypes.guess_type(filename)
+        mime_type = self._guess_mime_type(filename)
 
         return {
             "filename": filename,
-            "path": str(file_path),
-            "size": stat.st_size,
+            "path": os.path.join(self._assets_dir_str, filename),
+            "size": st.st_size,
             "mime_type": mime_type,
-            "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "modified_at": datetime.fromtimestamp(st.st_mtime).isoformat(),
         }
 
     def get_asset_content(self, filename: str) -> Optional[bytes]:
@@ -272,12 +427,40 @@ class AssetManager:
         if not is_valid:
             return None
 
-        file_path = self.assets_dir / filename
-
-        if not file_path.exists() or not file_path.is_file():
+        if self._stat_asset(filename) is None:
             return None
 
-        return file_path.read_bytes()
+        with open(os.path.join(self._assets_dir_str, filename), "rb") as f:
+            return f.read()
+
+    @contextmanager
+    def open_asset_view(self, filename: str) -> Iterator[Optional[Union[mmap.mmap, bytes]]]:
+        """
+        Map an asset read-only for zero-copy access.
+
+        Use this instead of get_asset_content() when the caller only needs
+        to scan, slice or hash the content. The mapping is closed when the
+        context exits.
+
+        Args:
+            filename: The asset filename
+
+        Yields:
+            A read-only mmap of the file (b"" for empty files),
+            or None if not found
+        """
+        is_valid, _ = self._validate_filename(filename)
+        if not is_valid or self._stat_asset(filename) is None:
+            yield None
+            return
+
+        with open(os.path.join(self._assets_dir_str, filename), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Zero-length files cannot be mapped
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                yield view
 
     def delete_asset(self, filename: str) -> bool:
         """
@@ -293,15 +476,13 @@ class AssetManager:
         if not is_valid:
             return False
 
-        file_path = self.assets_dir / filename
-
-        if not file_path.exists():
-            return False
-
         try:
-            file_path.unlink()
+            os.unlink(os.path.join(self._assets_dir_str, filename))
+            self._assets_changed()
             logger.info("Deleted asset: %s", filename)
             return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error("Failed to delete asset %s: %s", filename, e)
             return False
@@ -342,11 +523,27 @@ class AssetManager:
         """
         deleted = []
 
-        for asset in self.list_assets():
-            filename = asset["filename"]
-            if filename not in referenced_files:
-                if self.delete_asset(filename):
-                    deleted.append(filename)
+        try:
+            with os.scandir(self.assets_dir) as entries:
+                orphans = [
+                    entry for entry in entries
+                    if entry.name not in referenced_files
+                    and entry.is_file()
+                    and self._validate_filename(entry.name)[0]
+                ]
+        except FileNotFoundError:
+            return deleted
+
+        for entry in orphans:
+            try:
+                os.unlink(entry.path)
+                logger.info("Deleted asset: %s", entry.name)
+                deleted.append(entry.name)
+            except OSError as e:
+                logger.error("Failed to delete asset %s: %s", entry.name, e)
+
+        if deleted:
+            self._assets_changed()
 
         return deleted
 
@@ -358,18 +555,38 @@ class AssetManager:
             Total size in bytes
         """
         total = 0
-        for asset in self.list_assets():
-            total += asset["size"]
+        try:
+            with os.scandir(self.assets_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        total += entry.stat().st_size
+        except FileNotFoundError:
+            pass
         return total
 
 
+# MIME types for the allowed extensions, resolved once instead of per file
+_EXTENSION_MIME_TYPES: dict[str, Optional[str]] = {
+    ext: mimetypes.guess_type(f"asset.{ext}")[0]
+    for ext in AssetManager.ALLOWED_EXTENSIONS
+}
+
+
 # Cache of asset managers per project
 _asset_managers: dict[str, AssetManager] = {}
+_asset_managers_lock = threading.Lock()
 
 
 def get_asset_manager(project_dir: Path) -> AssetManager:
-    """Get or create an AssetManager for a project."""
+    """Get or create an AssetManager for a project (thread-safe)."""
     key = str(project_dir.resolve())
-    if key not in _asset_managers:
-        _asset_managers[key] = AssetManager(project_dir)
-    return _asset_managers[key]
+
+    # Double-checked locking so concurrent first requests build one manager
+    manager = _asset_managers.get(key)
+    if manager is None:
+        with _asset_managers_lock:
+            manager = _asset_managers.get(key)
+            if manager is None:
+                manager = AssetManager(project_dir)
+                _asset_managers[key] = manager
+    return manager
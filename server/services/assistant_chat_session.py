@@ -14,6 +14,7 @@ import shutil
 import sys
 import threading
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import AsyncGenerator, Optional
 
@@ -21,8 +22,10 @@ from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
 
 from .assistant_database import (
     add_message,
+    add_messages,
     create_conversation,
 )
+from .clock import utcnow
 
 logger = logging.getLogger(__name__)
 
@@ -63,18 +66,49 @@ READONLY_BUILTIN_TOOLS = [
     "WebSearch",
 ]
 
+# Resolved path of the system Claude CLI (looked up once it is found)
+_claude_cli: Optional[str] = None
+
+
+def get_claude_cli() -> Optional[str]:
+    """Get the system Claude CLI path, searching PATH only until it is found."""
+    global _claude_cli
+    if _claude_cli is None:
+        _claude_cli = shutil.which("claude")
+    return _claude_cli
+
+
+# Maximum number of app_spec.txt characters included in the system prompt
+APP_SPEC_PROMPT_CHARS = 5000
+
 
 def get_system_prompt(project_name: str, project_dir: Path) -> str:
-    """Generate the system prompt for the assistant with project context."""
+    """
+    Generate the system prompt for the assistant with project context.
+
+    The prompt is cached until app_spec.txt is modified.
+    """
+    app_spec_path = project_dir / "prompts" / "app_spec.txt"
+    try:
+        app_spec_mtime: Optional[int] = app_spec_path.stat().st_mtime_ns
+    except OSError:
+        app_spec_mtime = None
+    return _build_system_prompt(project_name, app_spec_path, app_spec_mtime)
+
+
+@lru_cache(maxsize=32)
+def _build_system_prompt(project_name: str, app_spec_path: Path, app_spec_mtime: Optional[int]) -> str:
+    """Build the system prompt; app_spec_mtime is part of the cache key only."""
     # Try to load app_spec.txt for context
     app_spec_content = ""
-    app_spec_path = project_dir / "prompts" / "app_spec.txt"
-    if app_spec_path.exists():
+    if app_spec_mtime is not None:
         try:
-            app_spec_content = app_spec_path.read_text(encoding="utf-8")
+            # Read just past the limit instead of the whole file
+            with open(app_spec_path, encoding="utf-8") as f:
+                app_spec_content = f.read(APP_SPEC_PROMPT_CHARS + 1)
             # Truncate if too long
-            if len(app_spec_content) > 5000:
-                app_spec_content = app_spec_content[:5000] + "\n... (truncated)"
+            if len(app_spec_content) > APP_SPEC_PROMPT_CHARS:
+                app_spec_content = app_spec_content[:APP_SPEC_PROMPT_CHARS] + "\n... (truncated)"
         except Exception as e:
             logger.warning(f"Failed to read app_spec.txt: {e}")
 
@@ -143,6 +177,18 @@ Your role is to help users understand the codebase, answer questions about featu
 8. Use inject_context to provide helpful hints to the agent about difficult features"""
 
 
+def _file_has_content(path: Path, content: str) -> bool:
+    """Check whether a file already holds exactly the given text."""
+    expected = content.encode("utf-8")
+    try:
+        # Cheap size check before reading the file back
+        if path.stat().st_size != len(expected):
+            return False
+        return path.read_bytes() == expected
+    except OSError:
+        return False
+
+
 class AssistantChatSession:
     """
     Manages a read-only assistant conversation for a project.
@@ -211,8 +257,10 @@ class AssistantChatSession:
             },
         }
         settings_file = self.project_dir / ".claude_assistant_settings.json"
-        with open(settings_file, "w") as f:
-            json.dump(security_settings, f, indent=2)
+        settings_json = json.dumps(security_settings, indent=2)
+        if not _file_has_content(settings_file, settings_json):
+            with open(settings_file, "w") as f:
+                f.write(settings_json)
 
         # Build MCP servers config - features MCP + agent control MCP
         mcp_servers = {
@@ -242,7 +290,7 @@ class AssistantChatSession:
         system_prompt = get_system_prompt(self.project_name, self.project_dir)
 
         # Use system Claude CLI
-        system_cli = shutil.which("claude")
+        system_cli = get_claude_cli()
 
         try:
             self.client = ClaudeSDKClient(
@@ -304,22 +352,32 @@ class AssistantChatSession:
             yield {"type": "error", "content": "No conversation ID set."}
             return
 
-        # Store user message in database
-        add_message(self.project_dir, self.conversation_id, "user", user_message)
+        # The user message and the response are stored in one transaction
+        # once streaming finishes (or fails)
+        pending_messages = [
+            {"role": "user", "content": user_message, "timestamp": utcnow()},
+        ]
 
         try:
-            async for chunk in self._query_claude(user_message):
+            async for chunk in self._query_claude(user_message, pending_messages):
                 yield chunk
             yield {"type": "response_done"}
         except Exception as e:
             logger.exception("Error during Claude query")
             yield {"type": "error", "content": f"Error: {str(e)}"}
-
-    async def _query_claude(self, message: str) -> AsyncGenerator[dict, None]:
+        finally:
+            add_messages(self.project_dir, self.conversation_id, pending_messages)
+
+    async def _query_claude(
+        self,
+        message: str,
+        pending_messages: list[dict]
+    ) -> AsyncGenerator[dict, None]:
         """
         Internal method to query Claude and stream responses.
 
-        Handles tool calls and text responses.
+        Handles tool calls and text responses. The complete response is
+        appended to pending_messages for the caller to persist.
         """
         if not self.client:
             return
@@ -352,9 +410,9 @@ class AssistantChatSession:
                             "input": tool_input,
                         }
 
-        # Store the complete response in the database
-        if full_response and self.conversation_id:
-            add_message(self.project_dir, self.conversation_id, "assistant", full_response)
+        # Queue the complete response for storage with the user message
+        if full_response:
+            pending_messages.append({"role": "assistant", "content": full_response})
 
     def get_conversation_id(self) -> Optional[int]:
         """Get the current conversation ID."""
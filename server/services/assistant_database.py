@@ -7,12 +7,29 @@ Each project has its own assistant.db file in the project directory.
 """
 
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, create_engine
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from typing import Iterator, Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    func,
+    insert,
+    text,
+)
+from sqlalchemy.orm import Session, declarative_base, relationship, sessionmaker
+
+from .clock import coarse_utcnow, utcnow
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +46,15 @@ class Conversation(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    messages = relationship("ConversationMessage", back_populates="conversation", cascade="all, delete-orphan")
+    # Messages are always fetched with explicit queries; touching this
+    # collection would be an N+1 in disguise, so make it fail loudly
+    messages = relationship(
+        "ConversationMessage",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
 
 
 class ConversationMessage(Base):
@@ -37,34 +62,123 @@ class ConversationMessage(Base):
     __tablename__ = "conversation_messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True)
     role = Column(String(20), nullable=False)  # "user" | "assistant" | "system"
     content = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     conversation = relationship("Conversation", back_populates="messages")
 
+    # Serves "messages of a conversation in order" straight from the index
+    __table_args__ = (
+        Index("ix_conversation_messages_conversation_timestamp", "conversation_id", "timestamp"),
+    )
+
+
+# Engines and session factories per project, created once (thread-safe)
+_engines: dict[str, tuple] = {}
+_engines_lock = threading.Lock()
+
 
 def get_db_path(project_dir: Path) -> Path:
     """Get the path to the assistant database for a project."""
     return project_dir / "assistant.db"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Tune each new SQLite connection for frequent small writes.
+
+    WAL avoids rewriting a rollback journal on every commit, and
+    synchronous=NORMAL is durable under WAL with one fewer fsync.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=134217728")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def _migrate_assistant_db(engine) -> None:
+    """Add indexes missing from databases created by older versions."""
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_conversation_messages_conversation_timestamp "
+            "ON conversation_messages (conversation_id, timestamp)"
+        ))
+        conn.commit()
+
+
+def _get_engine_and_sessionmaker(project_dir: Path) -> tuple:
+    """
+    Get or create the engine and sessionmaker for a project.
+
+    Tables are created only when the engine is first built.
+
+    Returns:
+        Tuple of (engine, Session)
+    """
+    key = project_dir.resolve().as_posix()
+
+    # Double-checked locking for thread safety
+    cached = _engines.get(key)
+    if cached is None:
+        with _engines_lock:
+            cached = _engines.get(key)
+            if cached is None:
+                db_path = get_db_path(project_dir)
+                # Use as_posix() for cross-platform compatibility with SQLite connection strings
+                db_url = f"sqlite:///{db_path.as_posix()}"
+                engine = create_engine(db_url, echo=False)
+                event.listen(engine, "connect", _set_sqlite_pragmas)
+                Base.metadata.create_all(engine)
+                _migrate_assistant_db(engine)
+                # Objects are returned after the session closes, so keep their loaded state
+                cached = (engine, sessionmaker(bind=engine, expire_on_commit=False))
+                _engines[key] = cached
+
+    return cached
+
+
 def get_engine(project_dir: Path):
     """Get or create a SQLAlchemy engine for a project's assistant database."""
-    db_path = get_db_path(project_dir)
-    # Use as_posix() for cross-platform compatibility with SQLite connection strings
-    db_url = f"sqlite:///{db_path.as_posix()}"
-    engine = create_engine(db_url, echo=False)
-    Base.metadata.create_all(engine)
+    engine, _ = _get_engine_and_sessionmaker(project_dir)
     return engine
 
 
 def get_session(project_dir: Path):
     """Get a new database session for a project."""
-    engine = get_engine(project_dir)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    _, session_factory = _get_engine_and_sessionmaker(project_dir)
+    return session_factory()
+
+
+@contextmanager
+def session_scope(project_dir: Path) -> Iterator[Session]:
+    """
+    Provide a session for a unit of work on a project's assistant database.
+
+    Commits when the block exits normally, rolls back if it raises, and
+    always closes the session.
+    """
+    session = get_session(project_dir)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def dispose_engine(project_dir: Path) -> None:
+    """Close and forget a project's cached engine (e.g. before deleting its files)."""
+    with _engines_lock:
+        cached = _engines.pop(project_dir.resolve().as_posix(), None)
+    if cached is not None:
+        cached[0].dispose()
 
 
 # ============================================================================
@@ -73,28 +187,26 @@ def get_session(project_dir: Path):
 
 def create_conversation(project_dir: Path, project_name: str, title: Optional[str] = None) -> Conversation:
     """Create a new conversation for a project."""
-    session = get_session(project_dir)
-    try:
+    with session_scope(project_dir) as session:
         conversation = Conversation(
             project_name=project_name,
             title=title,
         )
         session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
+        session.flush()
         logger.info(f"Created conversation {conversation.id} for project {project_name}")
         return conversation
-    finally:
-        session.close()
 
 
 def get_conversations(project_dir: Path, project_name: str) -> list[dict]:
     """Get all conversations for a project with message counts."""
-    session = get_session(project_dir)
-    try:
+    with session_scope(project_dir) as session:
+        # Count messages in the same query rather than loading each collection
         conversations = (
-            session.query(Conversation)
+            session.query(Conversation, func.count(ConversationMessage.id).label("message_count"))
+            .outerjoin(ConversationMessage, ConversationMessage.conversation_id == Conversation.id)
             .filter(Conversation.project_name == project_name)
+            .group_by(Conversation.id)
             .order_by(Conversation.updated_at.desc())
             .all()
         )
@@ -105,19 +217,26 @@ def get_conversations(project_dir: Path, project_name: str) -> list[dict]:
                 "title": c.title,
                 "created_at": c.created_at.isoformat() if c.created_at else None,
                 "updated_at": c.updated_at.isoformat() if c.updated_at else None,
-                "message_count": len(c.messages),
+                "message_count": message_count,
             }
-            for c in conversations
+            for c, message_count in conversations
         ]
-    finally:
-        session.close()
 
 
 def get_conversation(project_dir: Path, conversation_id: int) -> Optional[dict]:
     """Get a conversation with all its messages."""
-    session = get_session(project_dir)
-    try:
-        conversation = session.query(Conversation).filter(Conversation.id == conversation_id).first()
+    with session_scope(project_dir) as session:
+        conversation = (
+            session.query(
+                Conversation.id,
+                Conversation.project_name,
+                Conversation.title,
+                Conversation.created_at,
+                Conversation.updated_at,
+            )
+            .filter(Conversation.id == conversation_id)
+            .first()
+        )
         if not conversation:
             return None
         return {
@@ -126,33 +245,25 @@ def get_conversation(project_dir: Path, conversation_id: int) -> Optional[dict]:
             "title": conversation.title,
             "created_at": conversation.created_at.isoformat() if conversation.created_at else None,
             "updated_at": conversation.updated_at.isoformat() if conversation.updated_at else None,
-            "messages": [
-                {
-                    "id": m.id,
-                    "role": m.role,
-                    "content": m.content,
-                    "timestamp": m.timestamp.isoformat() if m.timestamp else None,
-                }
-                for m in sorted(conversation.messages, key=lambda x: x.timestamp or datetime.min)
-            ],
+            "messages": _query_messages(session, conversation_id),
         }
-    finally:
-        session.close()
 
 
 def delete_conversation(project_dir: Path, conversation_id: int) -> bool:
     """Delete a conversation and all its messages."""
-    session = get_session(project_dir)
-    try:
-        conversation = session.query(Conversation).filter(Conversation.id == conversation_id).first()
-        if not conversation:
+    with session_scope(project_dir) as session:
+        # Delete messages explicitly: databases created before the FK had
+        # ON DELETE CASCADE rely on it, and it's one statement either way
+        session.query(ConversationMessage).filter(
+            ConversationMessage.conversation_id == conversation_id
+        ).delete(synchronize_session=False)
+        deleted = session.query(Conversation).filter(
+            Conversation.id == conversation_id
+        ).delete(synchronize_session=False)
+        if not deleted:
             return False
-        session.delete(conversation)
-        session.commit()
         logger.info(f"Deleted conversation {conversation_id}")
         return True
-    finally:
-        session.close()
 
 
 # ============================================================================
@@ -161,8 +272,7 @@ def delete_conversation(project_dir: Path, conversation_id: int) -> bool:
 
 def add_message(project_dir: Path, conversation_id: int, role: str, content: str) -> Optional[dict]:
     """Add a message to a conversation."""
-    session = get_session(project_dir)
-    try:
+    with session_scope(project_dir) as session:
         conversation = session.query(Conversation).filter(Conversation.id == conversation_id).first()
         if not conversation:
             return None
@@ -175,15 +285,16 @@ def add_message(project_dir: Path, conversation_id: int, role: str, content: str
         session.add(message)
 
         # Update conversation's updated_at timestamp
-        conversation.updated_at = datetime.utcnow()
+        conversation.updated_at = coarse_utcnow()
 
         # Auto-generate title from first user message if not set
         if not conversation.title and role == "user":
             # Take first 50 chars of first user message as title
             conversation.title = content[:50] + ("..." if len(content) > 50 else "")
 
-        session.commit()
-        session.refresh(message)
+        # The id comes back from the INSERT and the timestamp default is
+        # applied client-side, so no reload is needed
+        session.flush()
 
         logger.debug(f"Added {role} message to conversation {conversation_id}")
         return {
@@ -192,28 +303,93 @@ def add_message(project_dir: Path, conversation_id: int, role: str, content: str
             "content": message.content,
             "timestamp": message.timestamp.isoformat() if message.timestamp else None,
         }
-    finally:
-        session.close()
 
 
-def get_messages(project_dir: Path, conversation_id: int) -> list[dict]:
-    """Get all messages for a conversation."""
-    session = get_session(project_dir)
-    try:
-        messages = (
-            session.query(ConversationMessage)
-            .filter(ConversationMessage.conversation_id == conversation_id)
-            .order_by(ConversationMessage.timestamp.asc())
-            .all()
-        )
-        return [
+def add_messages(project_dir: Path, conversation_id: int, messages: list[dict]) -> list[dict]:
+    """
+    Add several messages to a conversation in a single transaction.
+
+    Args:
+        project_dir: Project directory
+        conversation_id: Conversation to append to
+        messages: Dicts with "role", "content" and an optional "timestamp"
+
+    Returns:
+        The stored messages, or an empty list if the conversation doesn't exist
+    """
+    if not messages:
+        return []
+
+    with session_scope(project_dir) as session:
+        conversation = session.query(Conversation).filter(Conversation.id == conversation_id).first()
+        if not conversation:
+            return []
+
+        now = utcnow()
+        rows = [
             {
-                "id": m.id,
-                "role": m.role,
-                "content": m.content,
-                "timestamp": m.timestamp.isoformat() if m.timestamp else None,
+                "conversation_id": conversation_id,
+                "role": m["role"],
+                "content": m["content"],
+                "timestamp": m.get("timestamp") or now,
             }
             for m in messages
         ]
-    finally:
-        session.close()
+        # One executemany with RETURNING instead of an INSERT (and a reload
+        # after commit) per message
+        ids = session.execute(
+            insert(ConversationMessage).returning(
+                ConversationMessage.id, sort_by_parameter_order=True
+            ),
+            rows,
+        ).scalars().all()
+
+        # Update conversation's updated_at timestamp
+        conversation.updated_at = now
+
+        # Auto-generate title from first user message if not set
+        if not conversation.title:
+            first_user = next((m["content"] for m in messages if m["role"] == "user"), None)
+            if first_user:
+                conversation.title = first_user[:50] + ("..." if len(first_user) > 50 else "")
+
+        logger.debug(f"Added {len(rows)} messages to conversation {conversation_id}")
+        return [
+            {
+                "id": message_id,
+                "role": row["role"],
+                "content": row["content"],
+                "timestamp": row["timestamp"].isoformat(),
+            }
+            for message_id, row in zip(ids, rows)
+        ]
+
+
+def _query_messages(session, conversation_id: int) -> list[dict]:
+    """Fetch a conversation's messages as plain rows, without building ORM objects."""
+    rows = (
+        session.query(
+            ConversationMessage.id,
+            ConversationMessage.role,
+            ConversationMessage.content,
+            ConversationMessage.timestamp,
+        )
+        .filter(ConversationMessage.conversation_id == conversation_id)
+        .order_by(ConversationMessage.timestamp.asc(), ConversationMessage.id.asc())
+        .all()
+    )
+    return [
+        {
+            "id": m.id,
+            "role": m.role,
+            "content": m.content,
+            "timestamp": m.timestamp.isoformat() if m.timestamp else None,
+        }
+        for m in rows
+    ]
+
+
+def get_messages(project_dir: Path, conversation_id: int) -> list[dict]:
+    """Get all messages for a conversation."""
+    with session_scope(project_dir) as session:
+        return _query_messages(session, conversation_id)
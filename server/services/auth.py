@@ -5,9 +5,12 @@ Authentication Service
 Utilities for password hashing, JWT tokens, and MFA.
 """
 
+import hashlib
 import io
 import os
 import secrets
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -16,31 +19,91 @@ import pyotp
 import qrcode
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func, or_, text
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..models.user import Base, User
+from .clock import coarse_utcnow
 
 # Configuration
 SECRET_KEY = os.environ.get("NEXUS_SECRET_KEY", secrets.token_hex(32))
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded-token cache bound (entries expire with their token's "exp" claim)
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+# Password hashing (bcrypt cost is tunable per deployment; 12 is passlib's default,
+# and values are clamped to the 4-31 range bcrypt accepts)
+BCRYPT_ROUNDS = min(max(int(os.environ.get("NEXUS_BCRYPT_ROUNDS", 12)), 4), 31)
+# Upper bound on password input; bcrypt only reads the first 72 bytes anyway
+MAX_PASSWORD_BYTES = 4096
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__ident="2b",
+)
+# Load the bcrypt backend now rather than on the first login
+pwd_context.handler("bcrypt").get_backend()
 
 # Database setup - users stored in app data directory
 APP_DATA_DIR = Path.home() / ".nexus"
 APP_DATA_DIR.mkdir(parents=True, exist_ok=True)
 USERS_DB_PATH = APP_DATA_DIR / "users.db"
 
-engine = create_engine(f"sqlite:///{USERS_DB_PATH}", connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# LIFO pooling keeps reusing the most recent (warm page cache) connection
+engine = create_engine(
+    f"sqlite:///{USERS_DB_PATH}",
+    connect_args={"check_same_thread": False},
+    pool_use_lifo=True,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Use WAL so logins and profile reads don't block behind writes."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
+# Sessions live for one request; all column defaults are Python-side, so
+# committed objects don't need reloading
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
 
+def _migrate_users_db() -> None:
+    """Add indexes missing from databases created by older versions."""
+    with engine.connect() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_username_lower ON users (lower(username))"))
+        conn.commit()
+
+
+_migrate_users_db()
+
+# SQLite's lower() only folds ASCII, so lookup values are folded the same way
+# (str.lower() would also fold e.g. "Ä" and then never match the column)
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _fold(value: str) -> str:
+    """Lower-case a lookup value the way SQLite's lower() does."""
+    return value.translate(_ASCII_LOWER)
+
+
 def get_db() -> Session:
     """Get database session."""
     db = SessionLocal()
@@ -52,13 +115,27 @@ def get_db() -> Session:
 
 # Password utilities
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
+    """
+    Verify a password against its hash.
+
+    Results are deliberately not cached: a cache would let anyone holding a
+    memory dump test guesses at hash speed instead of bcrypt speed. Login
+    latency is set by the cost factor (NEXUS_BCRYPT_ROUNDS).
+    """
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """
+    Hash a password.
+
+    Raises:
+        ValueError: If the password is longer than MAX_PASSWORD_BYTES
+    """
+    password_bytes = password.encode("utf-8")
+    if len(password_bytes) > MAX_PASSWORD_BYTES:
+        raise ValueError(f"Password exceeds {MAX_PASSWORD_BYTES} bytes")
+    return pwd_context.hash(password_bytes[:72])
 
 
 # JWT utilities
@@ -74,14 +151,46 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
     return encoded_jwt
 
 
+# Verified token payloads keyed by a digest of the raw token: {key: (payload, exp)}
+_token_cache: dict[bytes, tuple[dict[str, Any], float]] = {}
+_token_cache_lock = threading.Lock()
+
+
 def decode_token(token: str) -> dict[str, Any] | None:
-    """Decode and verify a JWT token."""
+    """
+    Decode and verify a JWT token.
+
+    Successfully verified tokens are cached until their "exp" claim, so
+    repeated requests with the same bearer token skip signature checks.
+    Invalid tokens are never cached.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is not None:
+        payload, exp = cached
+        if exp > now:
+            return dict(payload)
+        with _token_cache_lock:
+            _token_cache.pop(key, None)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                _token_cache.pop(next(iter(_token_cache)))
+            _token_cache[key] = (dict(payload), float(exp))
+
+    return payload
+
 
 # MFA utilities
 def generate_mfa_secret() -> str:
@@ -102,9 +211,10 @@ def generate_qr_code(uri: str) -> bytes:
     qr.make(fit=True)
     img = qr.make_image(fill_color="black", back_color="white")
 
+    # getvalue() ignores the stream position and hands back the BytesIO's own
+    # buffer (trimmed in place) rather than a copy
     buffer = io.BytesIO()
     img.save(buffer, format="PNG")
-    buffer.seek(0)
     return buffer.getvalue()
 
 
@@ -116,13 +226,13 @@ def verify_totp(secret: str, code: str) -> bool:
 
 # User operations
 def get_user_by_email(db: Session, email: str) -> User | None:
-    """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    """Get user by email (case-insensitive)."""
+    return db.query(User).filter(func.lower(User.email) == _fold(email)).first()
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
-    """Get user by username."""
-    return db.query(User).filter(User.username == username).first()
+    """Get user by username (case-insensitive)."""
+    return db.query(User).filter(func.lower(User.username) == _fold(username)).first()
 
 
 def get_user_by_id(db: Session, user_id: int) -> User | None:
@@ -141,19 +251,43 @@ def create_user(db: Session, email: str, username: str, password: str, full_name
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
     return user
 
 
+# Hash checked against when no user matches, so lookups take constant time
+_dummy_password_hash: str | None = None
+
+
+def _get_dummy_password_hash() -> str:
+    """Get (creating on first use) a bcrypt hash of a random password."""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = pwd_context.hash(secrets.token_hex(16))
+    return _dummy_password_hash
+
+
 def authenticate_user(db: Session, email_or_username: str, password: str) -> User | None:
     """Authenticate a user by email/username and password."""
-    # Try email first
-    user = get_user_by_email(db, email_or_username)
-    if not user:
-        # Try username
-        user = get_user_by_username(db, email_or_username)
+    # Look up by email or username in one (indexed, case-insensitive) query.
+    # Older databases may hold accounts differing only in case, so exact
+    # matches come first (email before username), as with exact lookups.
+    login = _fold(email_or_username)
+    email_matches = func.lower(User.email) == login
+    username_matches = func.lower(User.username) == login
+    user = (
+        db.query(User)
+        .filter(or_(email_matches, username_matches))
+        .order_by(
+            (User.email == email_or_username).desc(),
+            (User.username == email_or_username).desc(),
+            email_matches.desc(),
+        )
+        .first()
+    )
 
     if not user:
+        # Still run bcrypt so unknown accounts can't be detected by timing
+        pwd_context.verify(password, _get_dummy_password_hash())
         return None
     if not verify_password(password, user.hashed_password):
         return None
@@ -163,12 +297,14 @@ def authenticate_user(db: Session, email_or_username: str, password: str) -> Use
 
 def update_user_last_login(db: Session, user: User) -> None:
     """Update user's last login timestamp."""
-    user.last_login = datetime.utcnow()
+    user.last_login = coarse_utcnow()
     db.commit()
 
 
 def enable_mfa(db: Session, user: User, secret: str) -> None:
     """Enable MFA for a user."""
+    if user.mfa_enabled and user.mfa_secret == secret:
+        return
     user.mfa_secret = secret
     user.mfa_enabled = True
     db.commit()
@@ -176,6 +312,8 @@ def enable_mfa(db: Session, user: User, secret: str) -> None:
 
 def disable_mfa(db: Session, user: User) -> None:
     """Disable MFA for a user."""
+    if not user.mfa_enabled and user.mfa_secret is None:
+        return
     user.mfa_secret = None
     user.mfa_enabled = False
     db.commit()
@@ -188,23 +326,24 @@ def update_user_profile(
     bio: str | None = None,
     avatar_url: str | None = None,
 ) -> User:
-    """Update user profile information."""
-    if full_name is not None:
-        user.full_name = full_name
-    if bio is not None:
-        user.bio = bio
-    if avatar_url is not None:
-        user.avatar_url = avatar_url
+    """Update user profile information (no write if nothing changed)."""
+    dirty = False
+    for field, value in (("full_name", full_name), ("bio", bio), ("avatar_url", avatar_url)):
+        if value is not None and getattr(user, field) != value:
+            setattr(user, field, value)
+            dirty = True
+    if not dirty:
+        return user
     db.commit()
-    db.refresh(user)
     return user
 
 
 def update_user_settings(db: Session, user: User, settings: str) -> User:
     """Update user settings (JSON string)."""
+    if user.settings == settings:
+        return user
     user.settings = settings
     db.commit()
-    db.refresh(user)
     return user
 
 
@@ -0,0 +1,34 @@
+"""
+Clock Helpers
+=============
+
+Timestamps for bookkeeping columns (updated_at, last_login) that don't need
+sub-100ms precision. Values are naive UTC to match the existing
+DateTime columns, which are populated with datetime.utcnow.
+"""
+
+import time
+from datetime import datetime, timezone
+
+# How long a computed timestamp is reused
+COARSE_CLOCK_TTL_SECONDS = 0.05
+
+# (monotonic time it was computed, value); replaced as a whole so readers
+# on other threads always see a consistent pair
+_cached: tuple[float, datetime] = (float("-inf"), datetime.min)
+
+
+def utcnow() -> datetime:
+    """Current naive UTC time (non-deprecated equivalent of datetime.utcnow())."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def coarse_utcnow() -> datetime:
+    """Current naive UTC time, reused for up to COARSE_CLOCK_TTL_SECONDS."""
+    global _cached
+    computed_at, value = _cached
+    now = time.monotonic()
+    if now - computed_at > COARSE_CLOCK_TTL_SECONDS:
+        value = utcnow()
+        _cached = (now, value)
+    return value
@@ -6,43 +6,68 @@ Validates code quality, security compliance, and tracks placeholders.
 Enforces best practices and OWASP Top 10 compliance.
 """
 
+import hashlib
 import json
 import logging
+import mmap
+import os
 import re
-from dataclasses import dataclass, asdict
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from ._parallel import map_chunks, walk_files
+
+try:
+    import re2  # Optional: linear-time matching for the whole-file prefilter
+except ImportError:
+    re2 = None
 
 logger = logging.getLogger(__name__)
 
 # File extensions to scan
-CODE_EXTENSIONS = {
+CODE_EXTENSIONS = frozenset({
     '.js', '.jsx', '.ts', '.tsx', '.vue', '.svelte',
     '.py', '.rb', '.php', '.go', '.java', '.cs',
     '.html', '.css', '.scss', '.sass', '.less',
-}
+})
 
 # Directories to skip
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     'node_modules', '.git', 'dist', 'build', '.next', '.nuxt',
     '__pycache__', 'venv', '.venv', 'env', '.env',
     'coverage', '.pytest_cache', '.mypy_cache',
     # Backup and test directories
     'backup', 'backups', 'ui-react-backup', 'old', 'archive',
     'test-results', 'playwright-report',
-}
+})
 
 # Files to skip (validator shouldn't flag itself)
-SKIP_FILES = {
+SKIP_FILES = frozenset({
     'code_validator.py',  # This file contains patterns as data
     'security.py',  # Security rules file
     '.env.example',  # Example env files have placeholder patterns
     'PLACEHOLDERS.md',  # Generated placeholder docs
-}
+})
+
+# Extensions without the leading dot, matched against name.rpartition('.')
+_CODE_EXTENSION_NAMES = frozenset(ext[1:] for ext in CODE_EXTENSIONS)
 
+# Files handed to each worker process per task when scanning in parallel
+SCAN_CHUNK_SIZE = 64
 
-@dataclass
+# Findings for files unchanged since the last scan, one JSON file per scanned
+# directory. Kept in the app data dir so nothing is written into (and then
+# committed from) the scanned project.
+SCAN_CACHE_DIR = Path.home() / '.nexus' / 'scan_cache'
+# Bump when scan_file changes in a way the rule catalogs don't capture
+SCAN_CACHE_VERSION = 1
+
+
+@dataclass(slots=True, frozen=True)
 class CodeIssue:
     """Represents a code quality or security issue."""
     severity: str  # critical, high, medium, low, info
@@ -53,8 +78,20 @@ class CodeIssue:
     message: str
     owasp_category: Optional[str] = None  # e.g., "A01:2021 - Broken Access Control"
 
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict without asdict's recursive copy."""
+        return {
+            'severity': self.severity,
+            'category': self.category,
+            'file_path': self.file_path,
+            'line_number': self.line_number,
+            'line_content': self.line_content,
+            'message': self.message,
+            'owasp_category': self.owasp_category,
+        }
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Placeholder:
     """Represents a legitimate placeholder that needs to be replaced."""
     file_path: str
@@ -64,6 +101,17 @@ class Placeholder:
     description: str
     required_action: str
 
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict without asdict's recursive copy."""
+        return {
+            'file_path': self.file_path,
+            'line_number': self.line_number,
+            'placeholder_type': self.placeholder_type,
+            'current_value': self.current_value,
+            'description': self.description,
+            'required_action': self.required_action,
+        }
+
 
 # =============================================================================
 # Pattern Definitions
@@ -184,28 +232,280 @@ LEGITIMATE_PLACEHOLDER_PATTERNS = [
 ]
 
 
+def _compile_rules(rules: list[tuple]) -> list[tuple]:
+    """Compile the regex leading each rule tuple once, case-insensitively."""
+    return [(re.compile(rule[0], re.IGNORECASE), *rule[1:]) for rule in rules]
+
+
+def _lowercase_pattern(pattern: str) -> str:
+    """Lower-case a regex's literal letters, leaving escapes such as \\S alone."""
+    return re.sub(r'\\.|[A-Z]+', lambda m: m.group() if m.group()[0] == '\\' else m.group().lower(), pattern)
+
+
+def _compile_alternation(patterns) -> re.Pattern:
+    """Combine regexes into one alternation that matches wherever any of them would."""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    """Index just past the group or character class opening at pattern[i]."""
+    depth = 0
+    in_class = False
+    while True:
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        i += 1
+        if in_class:
+            # A ']' right after '[' or '[^' is a literal member
+            in_class = char != ']' or pattern[i - 2] in '[^'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if depth == 0 and not in_class:
+            return i
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    Longest lower-cased substring that every match of a regex must contain.
+
+    Only runs of plain characters outside groups and classes count; a
+    character made optional by its quantifier ends the run instead. Returns
+    '' (which every line contains) when the pattern has a top-level alternation.
+    """
+    runs = []
+    run = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        literal = None
+        if char == '\\':
+            escaped = pattern[i + 1]
+            if not escaped.isalnum():
+                literal = escaped
+            i += 2
+        elif char in '([':
+            i = _skip_group(pattern, i)
+        elif char == '|':
+            return ''
+        else:
+            if char not in '.^$':
+                literal = char
+            i += 1
+
+        # Read the quantifier, if any, applying to this atom
+        minimum = 1
+        if i < len(pattern) and pattern[i] in '?*+{':
+            if pattern[i] == '{':
+                close = pattern.index('}', i)
+                minimum = int(pattern[i + 1:close].split(',')[0] or 0)
+                i = close + 1
+            else:
+                minimum = 0 if pattern[i] in '?*' else 1
+                i += 1
+            if i < len(pattern) and pattern[i] == '?':
+                i += 1
+            repeated = True
+        else:
+            repeated = False
+
+        if literal is not None and minimum:
+            run.append(literal)
+        if literal is None or repeated:
+            if run:
+                runs.append(''.join(run).lower())
+            run = []
+    if run:
+        runs.append(''.join(run).lower())
+    return max(runs, key=len, default='')
+
+
+# Prefilter over the whole catalog: most lines match no rule at all, so they
+# cost a single search instead of one per rule
+_ANY_RULE_RE = _compile_alternation(
+    rule[0] for rules in (
+        MOCK_DATA_PATTERNS, STUB_PATTERNS, SECURITY_PATTERNS, LEGITIMATE_PLACEHOLDER_PATTERNS,
+    ) for rule in rules
+)
+
+# Paths treated as test files
+_TEST_FILE_RE = re.compile(r'(test|spec|__tests__)', re.IGNORECASE)
+
+# str's ASCII whitespace minus \n: what \s matches within a single line
+_LINE_WHITESPACE_CLASS = '[\\t\\x0b\\x0c\\r\\x1c-\\x1f ]'
+
+
+def _strip_negative_lookaheads(pattern: str) -> str:
+    """
+    Remove (?!...) groups from a regex, which RE2 doesn't support.
+
+    Dropping a negative lookahead only widens what a pattern matches, which
+    is fine for a prefilter: candidate lines are re-checked with the real rules.
+    """
+    result = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('(?!', i):
+            depth = 0
+            in_class = False
+            while True:
+                char = pattern[i]
+                if char == '\\':
+                    i += 2
+                    continue
+                if in_class:
+                    in_class = char != ']'
+                elif char == '[':
+                    in_class = True
+                elif char == '(':
+                    depth += 1
+                elif char == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            i += 1
+            continue
+        step = 2 if pattern[i] == '\\' else 1
+        result.append(pattern[i:i + step])
+        i += step
+    return ''.join(result)
+
+
+def _compile_bytes_prefilter():
+    """
+    Compile the byte-level form of the prefilter for memory-mapped files.
+
+    On ASCII text without carriage returns it agrees with the str patterns
+    line by line: \\s is spelled out as str's ASCII whitespace minus \\n so
+    that a match (or a negative lookahead) can't reach across a line break.
+    Uses RE2's linear-time engine when google-re2 is installed.
+    """
+    pattern = _ANY_RULE_RE.pattern.replace('\\s', _LINE_WHITESPACE_CLASS)
+    if re2 is not None:
+        return re2.compile(_strip_negative_lookaheads(pattern).encode('ascii'), _re2_options())
+    return re.compile(pattern.encode('ascii'), re.IGNORECASE)
+
+
+def _re2_options():
+    """RE2 options matching the catalog's case-insensitive flag."""
+    options = re2.Options()
+    options.case_sensitive = False
+    return options
+
+
+def _compile_rule_set(patterns):
+    """
+    Compile a catalog into an RE2 set that reports every rule matching a line.
+
+    Like the bytes prefilter, each rule is widened (no lookaheads) so the
+    reported rules are a superset for ASCII lines; the exact rules confirm.
+    Returns None when google-re2 isn't installed.
+    """
+    if re2 is None:
+        return None
+    rule_set = re2.Set.SearchSet(_re2_options())
+    for pattern in patterns:
+        rule_set.Add(_strip_negative_lookaheads(pattern.replace('\\s', _LINE_WHITESPACE_CLASS)).encode('ascii'))
+    rule_set.Compile()
+    return rule_set
+
+
+_ANY_RULE_BYTES_RE = _compile_bytes_prefilter()
+
+
+@dataclass(slots=True, frozen=True)
+class _RuleCatalog:
+    """A rule catalog compiled every way scan_file needs it."""
+    rules: list[tuple]  # IGNORECASE, searched in non-ASCII lines as they are
+    ascii_rules: list[tuple]  # Lower-cased and case-sensitive, searched in lower-cased ASCII lines
+    needles: list[str]  # Literal anchor of each rule, checked with `in` before its regex runs
+    any_re: re.Pattern  # Whole-catalog alternation gating the rules on non-ASCII lines
+    rule_set: object  # RE2 set picking candidate rules, or None without google-re2
+
+
+def _build_catalog(rules: list[tuple]) -> _RuleCatalog:
+    """Compile a catalog's rules once at import."""
+    patterns = [rule[0] for rule in rules]
+    return _RuleCatalog(
+        rules=_compile_rules(rules),
+        ascii_rules=[(re.compile(_lowercase_pattern(rule[0])), *rule[1:]) for rule in rules],
+        needles=[_required_literal(pattern) for pattern in patterns],
+        any_re=_compile_alternation(patterns),
+        rule_set=_compile_rule_set(patterns),
+    )
+
+
+def _candidate_rules(catalog: _RuleCatalog, line: str, ascii_lower: Optional[str]) -> list[tuple]:
+    """
+    Rules of one catalog that may match a line, in catalog order.
+
+    For an ASCII line, ascii_lower is the line lower-cased and the returned
+    rules are to be searched in it. Case-folding once per line is cheaper
+    than IGNORECASE folding at every regex step; on ASCII text the two
+    agree. Other lines (ascii_lower is None) get the IGNORECASE rules,
+    because IGNORECASE also equates some non-ASCII letters with ASCII ones
+    (the long s with "s") that str.lower() leaves alone.
+    """
+    if ascii_lower is None:
+        return catalog.rules if catalog.any_re.search(line) else []
+    if catalog.rule_set is not None:
+        # Match() returns None rather than an empty list when nothing matches
+        matched = catalog.rule_set.Match(ascii_lower.encode('ascii')) or ()
+        return [catalog.ascii_rules[i] for i in sorted(matched)]
+    return [rule for rule, needle in zip(catalog.ascii_rules, catalog.needles) if needle in ascii_lower]
+
+
+# Per-catalog rules: a candidate line usually hits a single catalog, so the
+# rules of the others are ruled out with one check each
+_MOCK_DATA = _build_catalog(MOCK_DATA_PATTERNS)
+_STUB = _build_catalog(STUB_PATTERNS)
+_SECURITY = _build_catalog(SECURITY_PATTERNS)
+_LEGITIMATE_PLACEHOLDER = _build_catalog(LEGITIMATE_PLACEHOLDER_PATTERNS)
+
+# Files containing any of these bytes are decoded in full instead
+_NEEDS_DECODE_RE = re.compile(rb'[\x80-\xff\r]')
+
+# Lines that are clearly pattern definitions or documentation
+_PATTERN_DEFINITION_RE = _compile_alternation([
+    r"^\s*\(",  # Tuple/list item starting with (
+    r"r['\"]",  # Raw string (regex pattern)
+    r"re\.(search|match|findall|sub)",  # Regex function calls
+    r"Pattern.*=",  # Pattern variable assignment
+    r"_PATTERNS?\s*=",  # Pattern list definition
+    r"#.*pattern",  # Comment about patterns
+    r"description.*=",  # Description string
+    r"message.*=",  # Message string
+    r'^\s*["\'].*["\'],?\s*$',  # String-only line (documentation/checklist)
+    r"checks.*=",  # Checklist definition
+    r"Avoid\s+",  # Documentation about what to avoid
+    r"Don't\s+",  # Documentation about what not to do
+    r"Never\s+",  # Documentation warnings
+])
+
+
+def _rules_fingerprint() -> str:
+    """Hash of everything that decides a file's findings, so edits invalidate the scan cache."""
+    digest = hashlib.sha256()
+    for part in (
+        SCAN_CACHE_VERSION, MOCK_DATA_PATTERNS, STUB_PATTERNS, SECURITY_PATTERNS,
+        LEGITIMATE_PLACEHOLDER_PATTERNS, _PATTERN_DEFINITION_RE.pattern,
+    ):
+        digest.update(repr(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+_RULES_FINGERPRINT = _rules_fingerprint()
+
+
 def is_in_pattern_definition(line: str) -> bool:
     """Check if a line appears to be defining a regex pattern or documentation."""
-    # Skip lines that are clearly pattern definitions or documentation
-    pattern_indicators = [
-        r"^\s*\(",  # Tuple/list item starting with (
-        r"r['\"]",  # Raw string (regex pattern)
-        r"re\.(search|match|findall|sub)",  # Regex function calls
-        r"Pattern.*=",  # Pattern variable assignment
-        r"_PATTERNS?\s*=",  # Pattern list definition
-        r"#.*pattern",  # Comment about patterns
-        r"description.*=",  # Description string
-        r"message.*=",  # Message string
-        r'^\s*["\'].*["\'],?\s*$',  # String-only line (documentation/checklist)
-        r"checks.*=",  # Checklist definition
-        r"Avoid\s+",  # Documentation about what to avoid
-        r"Don't\s+",  # Documentation about what not to do
-        r"Never\s+",  # Documentation warnings
-    ]
-    for indicator in pattern_indicators:
-        if re.search(indicator, line, re.IGNORECASE):
-            return True
-    return False
+    return _PATTERN_DEFINITION_RE.search(line) is not None
 
 
 def is_in_string_literal(line: str, match_start: int) -> bool:
@@ -219,14 +519,60 @@ def is_in_string_literal(line: str, match_start: int) -> bool:
     return (single_quotes % 2 == 1) or (double_quotes % 2 == 1)
 
 
-def scan_file(file_path: Path) -> tuple[list[CodeIssue], list[Placeholder]]:
-    """Scan a single file for issues and placeholders."""
+def _iter_candidate_lines(data) -> Iterator[tuple[int, str]]:
+    """Yield (line_number, line) for lines of an ASCII, LF-only buffer that a rule may match."""
+    line_num = 1
+    counted = 0
+    pos = 0
+    while True:
+        match = _ANY_RULE_BYTES_RE.search(data, pos)
+        if match is None:
+            return
+        start = data.rfind(b'\n', 0, match.start()) + 1
+        end = data.find(b'\n', match.start())
+        if end == -1:
+            end = len(data)
+        line_num += data[counted:start].count(b'\n')
+        counted = start
+        yield line_num, data[start:end].decode('ascii')
+        pos = end + 1
+
+
+def _read_candidate_lines(file_path: Path) -> Optional[list[tuple[int, str]]]:
+    """
+    Memory-map a file and return the numbered lines a rule may match.
+
+    Returns None when the file has non-ASCII bytes or carriage returns and
+    must be decoded in full instead.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if _NEEDS_DECODE_RE.search(data):
+                return None
+            return list(_iter_candidate_lines(data))
+
+
+def scan_file(file_path: Path, first_match_only: bool = False) -> tuple[list[CodeIssue], list[Placeholder]]:
+    """
+    Scan a single file for issues and placeholders.
+
+    Plain ASCII files are prefiltered straight from a memory map, so only
+    lines that a rule may match are ever copied and decoded.
+
+    With first_match_only, each line reports at most one finding per
+    category (the first matching rule) instead of every rule it violates.
+    """
     issues = []
     placeholders = []
 
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
+        numbered_lines = _read_candidate_lines(file_path)
+        prefiltered = numbered_lines is not None
+        if not prefiltered:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            numbered_lines = enumerate(content.split('\n'), 1)
     except Exception as e:
         logger.warning(f"Could not read file {file_path}: {e}")
         return issues, placeholders
@@ -234,96 +580,226 @@ def scan_file(file_path: Path) -> tuple[list[CodeIssue], list[Placeholder]]:
     rel_path = str(file_path)
 
     # Check if this is a test file (more lenient with patterns)
-    is_test_file = bool(re.search(r'(test|spec|__tests__)', rel_path, re.IGNORECASE))
+    is_test_file = bool(_TEST_FILE_RE.search(rel_path))
 
-    for line_num, line in enumerate(lines, 1):
+    for line_num, line in numbered_lines:
         # Skip empty lines and very long lines (likely minified)
-        if not line.strip() or len(line) > 500:
+        stripped = line.strip()
+        if not stripped or len(line) > 500:
+            continue
+
+        # Skip lines no rule can match before running rules individually
+        # (memory-mapped files were already prefiltered as a whole)
+        if not prefiltered and not _ANY_RULE_RE.search(line):
             continue
 
         # Skip lines that are pattern definitions or documentation
         if is_in_pattern_definition(line):
             continue
 
+        # ASCII lines are case-folded once here rather than by every regex
+        ascii_lower = line.lower() if line.isascii() else None
+        subject = line if ascii_lower is None else ascii_lower
+        # Shared by every finding on this line
+        snippet = stripped[:100]
+
         # Check for mock data patterns
-        for pattern, message in MOCK_DATA_PATTERNS:
-            if re.search(pattern, line, re.IGNORECASE):
+        candidates = _candidate_rules(_MOCK_DATA, line, ascii_lower)
+        for pattern, message in candidates:
+            if pattern.search(subject):
                 issues.append(CodeIssue(
                     severity='high',
                     category='mock_data',
                     file_path=rel_path,
                     line_number=line_num,
-                    line_content=line.strip()[:100],
+                    line_content=snippet,
                     message=message,
                 ))
+                if first_match_only:
+                    break
 
         # Check for stub patterns
-        for pattern, message in STUB_PATTERNS:
-            if re.search(pattern, line, re.IGNORECASE):
+        candidates = _candidate_rules(_STUB, line, ascii_lower)
+        for pattern, message in candidates:
+            if pattern.search(subject):
                 issues.append(CodeIssue(
                     severity='medium',
                     category='placeholder',
                     file_path=rel_path,
                     line_number=line_num,
-                    line_content=line.strip()[:100],
+                    line_content=snippet,
                     message=message,
                 ))
+                if first_match_only:
+                    break
 
         # Check for security patterns
-        for pattern, message, owasp in SECURITY_PATTERNS:
-            if re.search(pattern, line, re.IGNORECASE):
+        candidates = _candidate_rules(_SECURITY, line, ascii_lower)
+        for pattern, message, owasp in candidates:
+            if pattern.search(subject):
                 issues.append(CodeIssue(
                     severity='critical' if 'injection' in message.lower() else 'high',
                     category='security',
                     file_path=rel_path,
                     line_number=line_num,
-                    line_content=line.strip()[:100],
+                    line_content=snippet,
                     message=message,
                     owasp_category=owasp,
                 ))
+                if first_match_only:
+                    break
 
         # Check for legitimate placeholders
-        for pattern, placeholder_type, description in LEGITIMATE_PLACEHOLDER_PATTERNS:
-            match = re.search(pattern, line, re.IGNORECASE)
+        candidates = _candidate_rules(_LEGITIMATE_PLACEHOLDER, line, ascii_lower)
+        for pattern, placeholder_type, description in candidates:
+            match = pattern.search(subject)
             if match:
                 placeholders.append(Placeholder(
                     file_path=rel_path,
                     line_number=line_num,
                     placeholder_type=placeholder_type,
-                    current_value=line.strip()[:100],
+                    current_value=snippet,
                     description=description,
                     required_action=f"Replace with actual {placeholder_type} value",
                 ))
+                if first_match_only:
+                    break
 
     return issues, placeholders
 
 
-def scan_directory(project_dir: Path) -> tuple[list[CodeIssue], list[Placeholder]]:
-    """Scan entire project directory for issues and placeholders."""
-    all_issues = []
-    all_placeholders = []
+def _select_code_file(name: str) -> bool:
+    """Whether a file name is a code file the validator scans."""
+    stem, _, extension = name.rpartition('.')
+    return bool(stem) and extension.lower() in _CODE_EXTENSION_NAMES and name not in SKIP_FILES
 
-    for file_path in project_dir.rglob('*'):
-        # Skip directories
-        if file_path.is_dir():
-            continue
 
-        # Skip non-code files
-        if file_path.suffix.lower() not in CODE_EXTENSIONS:
-            continue
+def _iter_code_files(directory: str) -> Iterator[str]:
+    """Yield paths of code files under a directory, pruning SKIP_DIRS."""
+    for path, _ in walk_files(directory, SKIP_DIRS, _select_code_file):
+        yield path
+
+
+def _scan_files(
+    paths: list[str], first_match_only: bool = False
+) -> list[tuple[list[CodeIssue], list[Placeholder]]]:
+    """Scan a batch of files, returning each file's findings; runs inside worker processes."""
+    return [scan_file(Path(path), first_match_only) for path in paths]
 
-        # Skip excluded directories
-        if any(skip_dir in file_path.parts for skip_dir in SKIP_DIRS):
-            continue
 
-        # Skip specific files
-        if file_path.name in SKIP_FILES:
+def _scan_paths(
+    paths: list[str], first_match_only: bool = False
+) -> list[tuple[list[CodeIssue], list[Placeholder]]]:
+    """Scan files and return their findings in the same order, in parallel batches when worthwhile."""
+    return map_chunks(partial(_scan_files, first_match_only=first_match_only), paths, SCAN_CHUNK_SIZE)
+
+
+def _load_scan_cache(cache_path: Path, fingerprint: str) -> dict:
+    """
+    Read cached findings as {relative path: [size, mtime_ns, issues, placeholders]}.
+
+    A missing or unreadable cache, or one written with another fingerprint
+    (other rules or scan mode), is treated as empty.
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable scan cache {cache_path}: {e}")
+        return {}
+
+    if not isinstance(data, dict) or data.get('fingerprint') != fingerprint:
+        return {}
+    files = data.get('files')
+    return files if isinstance(files, dict) else {}
+
+
+def _save_scan_cache(cache_path: Path, fingerprint: str, files: dict) -> None:
+    """Write the scan cache through a temporary file so readers never see half of it."""
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(
+            json.dumps({'fingerprint': fingerprint, 'files': files}),
+            encoding='utf-8',
+        )
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write scan cache {cache_path}: {e}")
+
+
+def _cached_findings(entry, stat_key: list[int]) -> Optional[tuple[list[CodeIssue], list[Placeholder]]]:
+    """Rebuild a file's findings from its cache entry, or None if it's stale or malformed."""
+    try:
+        if entry[:2] != stat_key:
+            return None
+        return [CodeIssue(**d) for d in entry[2]], [Placeholder(**d) for d in entry[3]]
+    except (TypeError, IndexError, KeyError):
+        return None
+
+
+def scan_directory(
+    project_dir: Path, use_cache: bool = True, first_match_only: bool = False
+) -> tuple[list[CodeIssue], list[Placeholder]]:
+    """
+    Scan entire project directory for issues and placeholders.
+
+    With use_cache, findings are stored under SCAN_CACHE_DIR in a file
+    named after the directory's resolved path, and files whose size and
+    modification time match the cached entry are not rescanned.
+    first_match_only is passed on to scan_file.
+    """
+    root = str(project_dir)
+    paths = list(_iter_code_files(root))
+    # Entries are keyed by path relative to the scanned directory
+    prefix_len = len(os.path.join(root, ''))
+    cache_name = hashlib.sha256(str(Path(root).resolve()).encode('utf-8')).hexdigest()[:32]
+    cache_path = SCAN_CACHE_DIR / f'{cache_name}.json'
+    # Findings carry file paths as spelled by the caller, so the spelling is
+    # part of the fingerprint
+    fingerprint = f"{_RULES_FINGERPRINT}{':first-match' if first_match_only else ''}:{root}"
+    cached = _load_scan_cache(cache_path, fingerprint) if use_cache else {}
+
+    findings = {}
+    new_cache = {}
+    stat_keys = {}
+    to_scan = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Let scan_file report it
+            to_scan.append(path)
             continue
+        stat_keys[path] = [st.st_size, st.st_mtime_ns]
+        entry = cached.get(path[prefix_len:])
+        result = _cached_findings(entry, stat_keys[path]) if entry is not None else None
+        if result is None:
+            to_scan.append(path)
+        else:
+            findings[path] = result
+            new_cache[path[prefix_len:]] = entry
+
+    for path, result in zip(to_scan, _scan_paths(to_scan, first_match_only)):
+        findings[path] = result
+        if path in stat_keys:
+            issues, placeholders = result
+            new_cache[path[prefix_len:]] = [
+                *stat_keys[path],
+                [i.to_dict() for i in issues],
+                [p.to_dict() for p in placeholders],
+            ]
+
+    if use_cache and (to_scan or len(new_cache) != len(cached)):
+        _save_scan_cache(cache_path, fingerprint, new_cache)
 
-        issues, placeholders = scan_file(file_path)
+    all_issues = []
+    all_placeholders = []
+    for path in paths:
+        issues, placeholders = findings[path]
         all_issues.extend(issues)
         all_placeholders.extend(placeholders)
-
     return all_issues, all_placeholders
 
 
@@ -338,7 +814,9 @@ def generate_placeholder_document(project_dir: Path, placeholders: list[Placehol
             by_type[p.placeholder_type] = []
         by_type[p.placeholder_type].append(p)
 
-    content = f"""# Placeholder Configuration Required
+    # Collected as parts and joined once rather than grown with +=
+    sorted_types = sorted(by_type.items())
+    parts = [f"""# Placeholder Configuration Required
 
 Generated: {datetime.now().isoformat()}
 
@@ -348,13 +826,13 @@ This document lists all configuration placeholders that need to be replaced with
 
 | Type | Count |
 |------|-------|
-"""
+"""]
 
-    for ptype, items in sorted(by_type.items()):
-        content += f"| {ptype} | {len(items)} |\n"
+    for ptype, items in sorted_types:
+        parts.append(f"| {ptype} | {len(items)} |\n")
 
-    content += f"\n**Total: {len(placeholders)} placeholders**\n\n"
-    content += "---\n\n"
+    parts.append(f"\n**Total: {len(placeholders)} placeholders**\n\n")
+    parts.append("---\n\n")
 
     # Detail each type
     type_descriptions = {
@@ -366,17 +844,19 @@ This document lists all configuration placeholders that need to be replaced with
         'env_var': 'Environment Variables',
     }
 
-    for ptype, items in sorted(by_type.items()):
-        content += f"## {type_descriptions.get(ptype, ptype.title())}\n\n"
+    for ptype, items in sorted_types:
+        parts.append(f"## {type_descriptions.get(ptype, ptype.title())}\n\n")
 
         for p in items:
-            content += f"### `{p.file_path}:{p.line_number}`\n\n"
-            content += f"**Type:** {p.placeholder_type}  \n"
-            content += f"**Description:** {p.description}  \n"
-            content += f"**Action Required:** {p.required_action}  \n\n"
-            content += f"```\n{p.current_value}\n```\n\n"
+            parts.append(
+                f"### `{p.file_path}:{p.line_number}`\n\n"
+                f"**Type:** {p.placeholder_type}  \n"
+                f"**Description:** {p.description}  \n"
+                f"**Action Required:** {p.required_action}  \n\n"
+                f"```\n{p.current_value}\n```\n\n"
+            )
 
-    content += """---
+    parts.append("""---
 
 ## How to Configure
 
@@ -394,8 +874,9 @@ This document lists all configuration placeholders that need to be replaced with
 - Never hardcode secrets in source code
 - Use environment variables for all sensitive configuration
 - Ensure `.env` is in `.gitignore`
-"""
+""")
 
+    content = "".join(parts)
     doc_path.write_text(content, encoding='utf-8')
     logger.info(f"Generated placeholder document: {doc_path}")
 
@@ -408,21 +889,18 @@ def generate_validation_report(
     placeholders: list[Placeholder]
 ) -> dict:
     """Generate a validation report summary."""
-    # Count by severity
+    # Count by severity, category and OWASP category in one pass
     severity_counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0}
+    category_counts = Counter()
+    owasp_counts = Counter()
+    blocking_issues = []
     for issue in issues:
         severity_counts[issue.severity] = severity_counts.get(issue.severity, 0) + 1
-
-    # Count by category
-    category_counts = {}
-    for issue in issues:
-        category_counts[issue.category] = category_counts.get(issue.category, 0) + 1
-
-    # OWASP violations
-    owasp_counts = {}
-    for issue in issues:
+        category_counts[issue.category] += 1
         if issue.owasp_category:
-            owasp_counts[issue.owasp_category] = owasp_counts.get(issue.owasp_category, 0) + 1
+            owasp_counts[issue.owasp_category] += 1
+        if issue.severity in ('critical', 'high') and len(blocking_issues) < 20:
+            blocking_issues.append(issue.to_dict())
 
     # Determine if code passes validation
     passes = severity_counts['critical'] == 0 and severity_counts['high'] == 0
@@ -432,13 +910,10 @@ def generate_validation_report(
         'total_issues': len(issues),
         'total_placeholders': len(placeholders),
         'severity_counts': severity_counts,
-        'category_counts': category_counts,
-        'owasp_violations': owasp_counts,
-        'blocking_issues': [asdict(i) for i in issues if i.severity in ('critical', 'high')][:20],
-        'placeholder_summary': {
-            p.placeholder_type: sum(1 for x in placeholders if x.placeholder_type == p.placeholder_type)
-            for p in placeholders
-        },
+        'category_counts': dict(category_counts),
+        'owasp_violations': dict(owasp_counts),
+        'blocking_issues': blocking_issues,
+        'placeholder_summary': dict(Counter(p.placeholder_type for p in placeholders)),
     }
 
 
@@ -471,8 +946,8 @@ def validate_project(project_dir: Path) -> dict:
 
     return {
         'passes': report['passes'],
-        'issues': [asdict(i) for i in issues],
-        'placeholders': [asdict(p) for p in placeholders],
+        'issues': [i.to_dict() for i in issues],
+        'placeholders': [p.to_dict() for p in placeholders],
         'report': report,
         'placeholder_document': str(placeholder_doc) if placeholder_doc else None,
     }
@@ -8,11 +8,16 @@ Creates documentation about architecture, components, APIs, and inner workings.
 
 import json
 import logging
+import os
 import re
-from dataclasses import dataclass, asdict
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from ._parallel import map_chunks, walk_files
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +34,86 @@ LANGUAGE_EXTENSIONS = {
 }
 
 # Directories to skip
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     'node_modules', '.git', 'dist', 'build', '.next', '.nuxt',
     '__pycache__', 'venv', '.venv', 'env', '.env',
     'coverage', '.pytest_cache', '.mypy_cache', '.cache',
+})
+
+# Framework names by the package that indicates them, in report order
+NPM_FRAMEWORKS = {
+    'vue': 'Vue.js',
+    'nuxt': 'Nuxt.js',
+    'react': 'React',
+    'next': 'Next.js',
+    'express': 'Express',
+    'fastify': 'Fastify',
+    'tailwindcss': 'Tailwind CSS',
+    'prisma': 'Prisma',
+}
+PIP_FRAMEWORKS = {
+    'fastapi': 'FastAPI',
+    'django': 'Django',
+    'flask': 'Flask',
+    'sqlalchemy': 'SQLAlchemy',
 }
 
+# Files larger than this (bundles, dumps, data) are reported by size only
+MAX_FILE_BYTES = 512 * 1024
+
+# Generated files that carry no useful structure
+GENERATED_FILE_SUFFIXES = ('.min.js', '.map', '-lock.json')
+
+# Test calls are only looked for in this much of a file not named as a test
+TEST_CALL_SCAN_CHARS = 64 * 1024
+
+# Files handed to each process pool task by analyze_project_structure
+EXTRACT_CHUNK_SIZE = 64
+
+# Most names of each kind recorded per file
+MAX_EXPORTS = 20
+MAX_IMPORTS = 30
+MAX_FUNCTIONS = 30
+MAX_CLASSES = 20
+
+# Lower-cased extension -> language, for O(1) lookups
+_EXTENSION_LANGUAGES = {
+    ext: lang
+    for lang, exts in reversed(LANGUAGE_EXTENSIONS.items())
+    for ext in exts
+}
+
+# Patterns used by extract_file_info, compiled once at import
+_JS_EXPORT_RE = re.compile(r'export\s+(?:default\s+)?(?:const|let|var|function|class|interface|type)\s+(\w+)')
+_JS_EXPORT_LIST_RE = re.compile(r'export\s*\{\s*([^}]+)\s*\}')
+_VUE_EXPORT_RE = re.compile(r'name:\s*["\'](\w+)["\']')
+
+# The clause between import and from is capped so that minified bundles,
+# with many "import" tokens on one long line, aren't rescanned to the end of
+# the line from each of them
+_JS_IMPORT_RE = re.compile(r'import\s+.{0,1000}?from\s+["\']([^"\']+)["\']')
+_JS_REQUIRE_RE = re.compile(r'require\s*\(\s*["\']([^"\']+)["\']')
+
+_JS_FUNCTION_RE = re.compile(r'(?:async\s+)?function\s+(\w+)')
+_JS_ARROW_FUNCTION_RE = re.compile(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>')
+_VUE_FUNCTION_RE = re.compile(r'(?:const|let|var|function)\s+(\w+)')
+
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)')
+
+# Top-level Python definitions and imports as
+# (def|async def|class, name, from-import module, rest of an import line)
+_PY_STATEMENT_RE = re.compile(
+    r'^(?:(def|async\s+def|class)\s+(\w+)|from\s+(\S+)\s+import\b|import\s+([^\n#;]+))',
+    re.MULTILINE,
+)
+_PY_MODULE_NAME_RE = re.compile(r'\s*([\w.]+)')
+
+_TEST_PATH_RE = re.compile(r'(?:test|spec|__tests__)', re.IGNORECASE)
+_TEST_CALL_RE = re.compile(r'(?:describe|it|test|expect)\s*\(')
+
+_PY_DOCSTRING_PREFIX_RE = re.compile(r'["\'\s]*')
+_JS_DOC_COMMENT_OPEN_RE = re.compile(r'\s*/\*')
+
 
 @dataclass
 class FileInfo:
@@ -50,6 +129,21 @@ class FileInfo:
     classes: list[str]
     description: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        """Serialize to a plain dict, sharing the name lists instead of copying them."""
+        return {
+            'path': self.path,
+            'language': self.language,
+            'line_count': self.line_count,
+            'size_bytes': self.size_bytes,
+            'has_tests': self.has_tests,
+            'exports': self.exports,
+            'imports': self.imports,
+            'functions': self.functions,
+            'classes': self.classes,
+            'description': self.description,
+        }
+
 
 @dataclass
 class ComponentInfo:
@@ -65,86 +159,203 @@ class ComponentInfo:
 
 def detect_language(file_path: Path) -> Optional[str]:
     """Detect programming language from file extension."""
-    ext = file_path.suffix.lower()
-    for lang, exts in LANGUAGE_EXTENSIONS.items():
-        if ext in exts:
-            return lang
+    return _EXTENSION_LANGUAGES.get(file_path.suffix.lower())
+
+
+def _iter_source_files(directory: str) -> Iterator[tuple[str, str]]:
+    """Yield (path, language) for files of a known language under a directory, pruning SKIP_DIRS."""
+    return walk_files(directory, SKIP_DIRS, _language_of_name)
+
+
+def _language_of_name(name: str) -> Optional[str]:
+    """Language of a file name, from its extension."""
+    stem, _, extension = name.rpartition('.')
+    return _EXTENSION_LANGUAGES.get('.' + extension.lower()) if stem else None
+
+
+def _captures(content: str, *patterns: re.Pattern) -> Iterator[str]:
+    """Lazily yield the first group of each match of each pattern, in turn."""
+    for pattern in patterns:
+        for match in pattern.finditer(content):
+            yield match.group(1)
+
+
+def _capped_unique(items: Iterable[str], limit: int) -> list[str]:
+    """First `limit` distinct items in order, without consuming the rest."""
+    seen = set()
+    unique = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            unique.append(item)
+            if len(unique) == limit:
+                break
+    return unique
+
+
+def _leading_block_comment(content: str) -> Optional[str]:
+    r"""
+    Stripped body of the /* ... */ or /** ... */ comment opening a file, or None.
+
+    Gives what r'^\s*/\*\*?\s*(.*?)\s*\*/' (DOTALL) captured, in linear
+    time; that regex backtracks polynomially over a comment that isn't closed.
+    """
+    opening = _JS_DOC_COMMENT_OPEN_RE.match(content)
+    if opening is None:
+        return None
+    start = opening.end()
+    # Prefer reading "/**" as the opener, as the regex's greedy \*? does
+    if content.startswith('*', start):
+        end = content.find('*/', start + 1)
+        if end != -1:
+            return content[start + 1:end].strip()
+    end = content.find('*/', start)
+    if end == -1:
+        return None
+    return content[start:end].strip()
+
+
+def _leading_docstring(content: str) -> Optional[str]:
+    """
+    Body of the triple-quoted string opening a file, or None.
+
+    Equivalent to lazily matching a triple-quoted string after any leading
+    quotes and whitespace, in linear time. A regex doing that rescans the
+    rest of the file from every quote of a long leading run.
+    """
+    prefix_end = _PY_DOCSTRING_PREFIX_RE.match(content).end()
+    last_close = max(content.rfind('"""'), content.rfind("'''"))
+    # The regex backtracks from the longest prefix, so the last opener wins
+    for start in range(prefix_end, -1, -1):
+        if last_close < start + 3 or not content.startswith(('"""', "'''"), start):
+            continue
+        body_start = start + 3
+        closes = [i for i in (content.find('"""', body_start), content.find("'''", body_start)) if i != -1]
+        return content[body_start:min(closes)]
     return None
 
 
-def extract_file_info(file_path: Path, project_dir: Path) -> Optional[FileInfo]:
-    """Extract information from a source file."""
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
-        language = detect_language(file_path)
+def _read_source(file_path: Path) -> tuple[Optional[str], int]:
+    """
+    Read a file as read_text(encoding='utf-8', errors='ignore') would.
 
-        if not language:
+    Returns (content, size in bytes). Content is None, without reading, for
+    files over MAX_FILE_BYTES. The size is taken from the open file, and the
+    read is bounded in case it grew since.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > MAX_FILE_BYTES:
+            return None, size
+        data = f.read(MAX_FILE_BYTES + 1)
+    if len(data) > MAX_FILE_BYTES:
+        return None, len(data)
+
+    content = data.decode('utf-8', errors='ignore')
+    # Universal newlines, as in text mode
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content, len(data)
+
+
+def extract_file_info(
+    file_path: Path, project_dir: Path, language: Optional[str] = None
+) -> Optional[FileInfo]:
+    """
+    Extract information from a source file.
+
+    The language is detected from the extension unless already known.
+    Returns None for unknown languages and generated files
+    (GENERATED_FILE_SUFFIXES). Files over MAX_FILE_BYTES aren't read; their
+    info carries only the language, size and whether the path names a test.
+    """
+    try:
+        if language is None:
+            language = detect_language(file_path)
+        if not language or file_path.name.endswith(GENERATED_FILE_SUFFIXES):
             return None
 
         rel_path = str(file_path.relative_to(project_dir))
 
-        # Extract exports
+        content, size = _read_source(file_path)
+        if content is None:
+            logger.debug(f"Not reading large file {file_path}")
+            return FileInfo(
+                path=rel_path,
+                language=language,
+                line_count=0,
+                size_bytes=size,
+                has_tests=_TEST_PATH_RE.search(rel_path) is not None,
+                exports=[],
+                imports=[],
+                functions=[],
+                classes=[],
+            )
+
+        # Extract exports, imports, functions and classes
         exports = []
-        if language in ('javascript', 'typescript'):
-            exports = re.findall(r'export\s+(?:default\s+)?(?:const|let|var|function|class|interface|type)\s+(\w+)', content)
-            exports += re.findall(r'export\s*\{\s*([^}]+)\s*\}', content)
-        elif language == 'python':
-            exports = re.findall(r'^(?:def|class)\s+(\w+)', content, re.MULTILINE)
-        elif language == 'vue':
-            exports = re.findall(r'name:\s*["\'](\w+)["\']', content)
-
-        # Extract imports
         imports = []
-        if language in ('javascript', 'typescript', 'vue'):
-            imports = re.findall(r'import\s+.*?from\s+["\']([^"\']+)["\']', content)
-            imports += re.findall(r'require\s*\(\s*["\']([^"\']+)["\']', content)
-        elif language == 'python':
-            imports = re.findall(r'^(?:from\s+(\S+)\s+)?import\s+(\S+)', content, re.MULTILINE)
-            imports = [i[0] or i[1] for i in imports]
-
-        # Extract functions
         functions = []
-        if language in ('javascript', 'typescript'):
-            functions = re.findall(r'(?:async\s+)?function\s+(\w+)', content)
-            functions += re.findall(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>', content)
-        elif language == 'python':
-            functions = re.findall(r'^def\s+(\w+)', content, re.MULTILINE)
-        elif language == 'vue':
-            functions = re.findall(r'(?:const|let|var|function)\s+(\w+)', content)
-
-        # Extract classes
         classes = []
-        if language in ('javascript', 'typescript'):
-            classes = re.findall(r'class\s+(\w+)', content)
-        elif language == 'python':
-            classes = re.findall(r'^class\s+(\w+)', content, re.MULTILINE)
-
-        # Check if test file
-        has_tests = bool(re.search(r'(?:test|spec|__tests__)', rel_path, re.IGNORECASE))
-        has_tests = has_tests or bool(re.search(r'(?:describe|it|test|expect)\s*\(', content))
+        if language == 'python':
+            # Definitions and imports all start a line, so one pass finds them all
+            for keyword, name, from_module, imported in _PY_STATEMENT_RE.findall(content):
+                if keyword == 'class':
+                    classes.append(name)
+                    exports.append(name)
+                elif keyword:
+                    functions.append(name)
+                    exports.append(name)
+                elif from_module:
+                    imports.append(from_module)
+                else:
+                    # import a, b.c as d
+                    for clause in imported.split(','):
+                        module = _PY_MODULE_NAME_RE.match(clause)
+                        if module:
+                            imports.append(module.group(1))
+            exports = _capped_unique(exports, MAX_EXPORTS)
+            imports = _capped_unique(imports, MAX_IMPORTS)
+            functions = _capped_unique(functions, MAX_FUNCTIONS)
+            classes = _capped_unique(classes, MAX_CLASSES)
+        elif language in ('javascript', 'typescript'):
+            # Matching stops as soon as enough distinct names are found
+            exports = _capped_unique(_captures(content, _JS_EXPORT_RE, _JS_EXPORT_LIST_RE), MAX_EXPORTS)
+            imports = _capped_unique(_captures(content, _JS_IMPORT_RE, _JS_REQUIRE_RE), MAX_IMPORTS)
+            functions = _capped_unique(_captures(content, _JS_FUNCTION_RE, _JS_ARROW_FUNCTION_RE), MAX_FUNCTIONS)
+            classes = _capped_unique(_captures(content, _JS_CLASS_RE), MAX_CLASSES)
+        elif language == 'vue':
+            exports = _capped_unique(_captures(content, _VUE_EXPORT_RE), MAX_EXPORTS)
+            imports = _capped_unique(_captures(content, _JS_IMPORT_RE, _JS_REQUIRE_RE), MAX_IMPORTS)
+            functions = _capped_unique(_captures(content, _VUE_FUNCTION_RE), MAX_FUNCTIONS)
+
+        # Check if test file: by name, else by test calls near the top
+        has_tests = (
+            _TEST_PATH_RE.search(rel_path) is not None
+            or _TEST_CALL_RE.search(content, 0, TEST_CALL_SCAN_CHARS) is not None
+        )
 
         # Extract description from file docstring/comment
         description = None
         if language == 'python':
-            match = re.match(r'^["\'\s]*(?:"""|\'\'\')(.*?)(?:"""|\'\'\')', content, re.DOTALL)
-            if match:
-                description = match.group(1).strip().split('\n')[0]
+            docstring = _leading_docstring(content)
+            if docstring is not None:
+                description = docstring.strip().split('\n')[0]
         elif language in ('javascript', 'typescript'):
-            match = re.match(r'^\s*/\*\*?\s*(.*?)\s*\*/', content, re.DOTALL)
-            if match:
-                description = match.group(1).strip().split('\n')[0].replace('*', '').strip()
+            comment = _leading_block_comment(content)
+            if comment is not None:
+                description = comment.split('\n')[0].replace('*', '').strip()
 
         return FileInfo(
             path=rel_path,
             language=language,
-            line_count=len(lines),
+            line_count=content.count('\n') + 1,
             size_bytes=len(content),
             has_tests=has_tests,
-            exports=list(set(exports))[:20],  # Limit to top 20
-            imports=list(set(imports))[:30],  # Limit to top 30
-            functions=list(set(functions))[:30],
-            classes=list(set(classes))[:20],
+            exports=exports,
+            imports=imports,
+            functions=functions,
+            classes=classes,
             description=description,
         )
 
@@ -153,8 +364,38 @@ def extract_file_info(file_path: Path, project_dir: Path) -> Optional[FileInfo]:
         return None
 
 
+def _extract_files(files: list[tuple[str, str]], project_dir: Path) -> list[Optional[FileInfo]]:
+    """Run extract_file_info over a batch of (path, language) pairs."""
+    return [extract_file_info(Path(path), project_dir, language) for path, language in files]
+
+
+def _extract_paths(files: list[tuple[str, str]], project_dir: Path) -> list[Optional[FileInfo]]:
+    """Extract file info for each (path, language) pair, in the same order, in parallel batches when worthwhile."""
+    return map_chunks(partial(_extract_files, project_dir=project_dir), files, EXTRACT_CHUNK_SIZE)
+
+
 def analyze_project_structure(project_dir: Path) -> dict:
     """Analyze project structure and return summary."""
+    return _analyze_project(project_dir)[0]
+
+
+def _group_by_dir(files: list[dict]) -> dict[str, list[dict]]:
+    """Group file dicts by their directory ('root' for the project directory)."""
+    by_dir: dict[str, list[dict]] = {}
+    for f in files:
+        by_dir.setdefault(os.path.dirname(f['path']) or 'root', []).append(f)
+    return by_dir
+
+
+def _analyze_project(project_dir: Path) -> tuple[dict, Optional[dict], dict[str, list[dict]]]:
+    """
+    Analyze a project for documentation.
+
+    Returns:
+        Tuple of (structure summary, parsed package.json or None, file
+        dicts grouped by directory), so the documentation sections neither
+        re-read package.json nor regroup the files.
+    """
     structure = {
         'directories': [],
         'file_count': 0,
@@ -163,30 +404,19 @@ def analyze_project_structure(project_dir: Path) -> dict:
         'frameworks': [],
         'files': [],
     }
+    package = None
+    by_dir: dict[str, list[dict]] = {}
 
     # Detect frameworks from package.json or requirements.txt
     package_json = project_dir / 'package.json'
     if package_json.exists():
         try:
-            pkg = json.loads(package_json.read_text())
-            deps = {**pkg.get('dependencies', {}), **pkg.get('devDependencies', {})}
-
-            if 'vue' in deps:
-                structure['frameworks'].append('Vue.js')
-            if 'nuxt' in deps:
-                structure['frameworks'].append('Nuxt.js')
-            if 'react' in deps:
-                structure['frameworks'].append('React')
-            if 'next' in deps:
-                structure['frameworks'].append('Next.js')
-            if 'express' in deps:
-                structure['frameworks'].append('Express')
-            if 'fastify' in deps:
-                structure['frameworks'].append('Fastify')
-            if 'tailwindcss' in deps:
-                structure['frameworks'].append('Tailwind CSS')
-            if 'prisma' in deps:
-                structure['frameworks'].append('Prisma')
+            package = json.loads(package_json.read_text())
+            deps = {**package.get('dependencies', {}), **package.get('devDependencies', {})}
+
+            structure['frameworks'].extend(
+                name for package, name in NPM_FRAMEWORKS.items() if package in deps
+            )
         except Exception:
             pass
 
@@ -194,81 +424,76 @@ def analyze_project_structure(project_dir: Path) -> dict:
     if requirements.exists():
         try:
             reqs = requirements.read_text().lower()
-            if 'fastapi' in reqs:
-                structure['frameworks'].append('FastAPI')
-            if 'django' in reqs:
-                structure['frameworks'].append('Django')
-            if 'flask' in reqs:
-                structure['frameworks'].append('Flask')
-            if 'sqlalchemy' in reqs:
-                structure['frameworks'].append('SQLAlchemy')
+            structure['frameworks'].extend(
+                name for package, name in PIP_FRAMEWORKS.items() if package in reqs
+            )
         except Exception:
             pass
 
     # Scan files
-    for file_path in project_dir.rglob('*'):
-        if file_path.is_dir():
-            continue
+    files = list(_iter_source_files(str(project_dir)))
+    dirs = set()
+    languages = []
+    for file_info in _extract_paths(files, project_dir):
+        if file_info:
+            file_dict = file_info.to_dict()
+            structure['files'].append(file_dict)
+            structure['line_count'] += file_info.line_count
+            languages.append(file_info.language)
 
-        if any(skip_dir in file_path.parts for skip_dir in SKIP_DIRS):
-            continue
+            directory = os.path.dirname(file_info.path)
+            by_dir.setdefault(directory or 'root', []).append(file_dict)
 
-        language = detect_language(file_path)
-        if not language:
-            continue
+            # Record the file's directory and its ancestors, stopping at the
+            # first one already seen (its ancestors are then known too)
+            while directory and directory not in dirs:
+                dirs.add(directory)
+                directory = os.path.dirname(directory)
 
-        file_info = extract_file_info(file_path, project_dir)
-        if file_info:
-            structure['files'].append(asdict(file_info))
-            structure['file_count'] += 1
-            structure['line_count'] += file_info.line_count
-            structure['languages'][language] = structure['languages'].get(language, 0) + 1
+    structure['file_count'] = len(structure['files'])
+    structure['languages'] = dict(Counter(languages))
+    structure['directories'] = sorted(d.replace(os.sep, '/') for d in dirs)
 
-    # Get unique directories
-    dirs = set()
-    for f in structure['files']:
-        path_parts = Path(f['path']).parts[:-1]
-        for i in range(len(path_parts)):
-            dirs.add('/'.join(path_parts[:i+1]))
-    structure['directories'] = sorted(dirs)
+    return structure, package, by_dir
 
-    return structure
+
+# Header of the dependency tables in the generated documentation
+_PACKAGE_TABLE_HEADER = "| Package | Version |\n|---------|---------|\n"
 
 
 def generate_architecture_section(structure: dict) -> str:
     """Generate architecture overview section."""
-    content = "## Architecture Overview\n\n"
+    parts = ["## Architecture Overview\n\n"]
 
     # Frameworks
     if structure['frameworks']:
-        content += "### Technology Stack\n\n"
+        parts.append("### Technology Stack\n\n")
         for fw in structure['frameworks']:
-            content += f"- **{fw}**\n"
-        content += "\n"
+            parts.append(f"- **{fw}**\n")
+        parts.append("\n")
 
     # Languages
-    content += "### Languages\n\n"
-    content += "| Language | Files | Percentage |\n"
-    content += "|----------|-------|------------|\n"
+    parts.append("### Languages\n\n")
+    parts.append("| Language | Files | Percentage |\n")
+    parts.append("|----------|-------|------------|\n")
     total = sum(structure['languages'].values())
     for lang, count in sorted(structure['languages'].items(), key=lambda x: -x[1]):
         pct = (count / total * 100) if total > 0 else 0
-        content += f"| {lang.title()} | {count} | {pct:.1f}% |\n"
-    content += "\n"
+        parts.append(f"| {lang.title()} | {count} | {pct:.1f}% |\n")
+    parts.append("\n")
 
     # Project stats
-    content += "### Project Statistics\n\n"
-    content += f"- **Total Files:** {structure['file_count']}\n"
-    content += f"- **Total Lines of Code:** {structure['line_count']:,}\n"
-    content += f"- **Directories:** {len(structure['directories'])}\n\n"
+    parts.append("### Project Statistics\n\n")
+    parts.append(f"- **Total Files:** {structure['file_count']}\n")
+    parts.append(f"- **Total Lines of Code:** {structure['line_count']:,}\n")
+    parts.append(f"- **Directories:** {len(structure['directories'])}\n\n")
 
-    return content
+    return ''.join(parts)
 
 
 def generate_directory_structure(structure: dict) -> str:
     """Generate directory structure section."""
-    content = "## Directory Structure\n\n"
-    content += "```\n"
+    parts = ["## Directory Structure\n\n", "```\n"]
 
     # Build tree
     dirs = sorted(structure['directories'])
@@ -276,28 +501,26 @@ def generate_directory_structure(structure: dict) -> str:
         depth = d.count('/')
         indent = "  " * depth
         name = d.split('/')[-1]
-        content += f"{indent}{name}/\n"
+        parts.append(f"{indent}{name}/\n")
 
     if len(dirs) > 30:
-        content += f"  ... and {len(dirs) - 30} more directories\n"
+        parts.append(f"  ... and {len(dirs) - 30} more directories\n")
 
-    content += "```\n\n"
-    return content
+    parts.append("```\n\n")
+    return ''.join(parts)
 
 
-def generate_components_section(structure: dict) -> str:
-    """Generate components/modules documentation."""
-    content = "## Components & Modules\n\n"
+def generate_components_section(structure: dict, by_dir: Optional[dict[str, list[dict]]] = None) -> str:
+    """
+    Generate components/modules documentation.
 
-    # Group files by directory
-    by_dir: dict[str, list] = {}
-    for f in structure['files']:
-        dir_path = str(Path(f['path']).parent)
-        if dir_path == '.':
-            dir_path = 'root'
-        if dir_path not in by_dir:
-            by_dir[dir_path] = []
-        by_dir[dir_path].append(f)
+    by_dir is the grouping returned by _analyze_project; it is rebuilt from
+    structure['files'] when not given.
+    """
+    parts = ["## Components & Modules\n\n"]
+
+    if by_dir is None:
+        by_dir = _group_by_dir(structure['files'])
 
     # Document key directories
     key_dirs = ['src', 'components', 'pages', 'views', 'api', 'services', 'utils', 'lib', 'stores', 'composables']
@@ -307,54 +530,54 @@ def generate_components_section(structure: dict) -> str:
         if not matching_dirs:
             continue
 
-        content += f"### {key_dir.title()}\n\n"
+        parts.append(f"### {key_dir.title()}\n\n")
 
         for dir_path in sorted(matching_dirs)[:5]:  # Limit subdirs
             files = by_dir[dir_path]
 
             for f in files[:10]:  # Limit files per dir
-                content += f"#### `{f['path']}`\n\n"
+                parts.append(f"#### `{f['path']}`\n\n")
 
                 if f.get('description'):
-                    content += f"{f['description']}\n\n"
+                    parts.append(f"{f['description']}\n\n")
 
                 if f.get('classes'):
-                    content += f"**Classes:** `{'`, `'.join(f['classes'][:5])}`\n\n"
+                    parts.append(f"**Classes:** `{'`, `'.join(f['classes'][:5])}`\n\n")
 
                 if f.get('functions'):
-                    content += f"**Functions:** `{'`, `'.join(f['functions'][:8])}`\n\n"
+                    parts.append(f"**Functions:** `{'`, `'.join(f['functions'][:8])}`\n\n")
 
                 if f.get('exports'):
-                    content += f"**Exports:** `{'`, `'.join(f['exports'][:5])}`\n\n"
+                    parts.append(f"**Exports:** `{'`, `'.join(f['exports'][:5])}`\n\n")
 
-    return content
+    return ''.join(parts)
 
 
 def generate_api_section(structure: dict) -> str:
     """Generate API documentation section."""
-    content = "## API Reference\n\n"
+    parts = ["## API Reference\n\n"]
 
     # Find API-related files
     api_files = [f for f in structure['files']
                  if any(x in f['path'].lower() for x in ['api', 'routes', 'endpoints', 'server'])]
 
     if not api_files:
-        content += "_No API files detected._\n\n"
-        return content
+        parts.append("_No API files detected._\n\n")
+        return ''.join(parts)
 
-    content += "### Endpoints\n\n"
+    parts.append("### Endpoints\n\n")
 
     for f in api_files[:15]:
-        content += f"#### `{f['path']}`\n\n"
+        parts.append(f"#### `{f['path']}`\n\n")
 
         if f.get('functions'):
-            content += "| Function | Description |\n"
-            content += "|----------|-------------|\n"
+            parts.append("| Function | Description |\n")
+            parts.append("|----------|-------------|\n")
             for func in f['functions'][:10]:
-                content += f"| `{func}` | |\n"
-            content += "\n"
+                parts.append(f"| `{func}` | |\n")
+            parts.append("\n")
 
-    return content
+    return ''.join(parts)
 
 
 def generate_technical_documentation(project_dir: Path) -> tuple[str, Path]:
@@ -364,10 +587,10 @@ def generate_technical_documentation(project_dir: Path) -> tuple[str, Path]:
     Returns:
         Tuple of (markdown content, output file path)
     """
-    structure = analyze_project_structure(project_dir)
+    structure, package, by_dir = _analyze_project(project_dir)
 
-    # Build the documentation
-    doc = f"""# Technical Documentation
+    # Build the documentation as parts joined once at the end
+    parts = [f"""# Technical Documentation
 
 **Project:** {project_dir.name}
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -388,55 +611,53 @@ def generate_technical_documentation(project_dir: Path) -> tuple[str, Path]:
 
 ---
 
-"""
+"""]
 
-    doc += generate_architecture_section(structure)
-    doc += generate_directory_structure(structure)
-    doc += generate_components_section(structure)
-    doc += generate_api_section(structure)
+    parts.append(generate_architecture_section(structure))
+    parts.append(generate_directory_structure(structure))
+    parts.append(generate_components_section(structure, by_dir))
+    parts.append(generate_api_section(structure))
 
     # Dependencies section
-    doc += "## Dependencies\n\n"
+    parts.append("## Dependencies\n\n")
 
-    package_json = project_dir / 'package.json'
-    if package_json.exists():
+    if package is not None:
         try:
-            pkg = json.loads(package_json.read_text())
-            deps = pkg.get('dependencies', {})
-            dev_deps = pkg.get('devDependencies', {})
+            deps = package.get('dependencies', {})
+            dev_deps = package.get('devDependencies', {})
 
             if deps:
-                doc += "### Production Dependencies\n\n"
-                doc += "| Package | Version |\n"
-                doc += "|---------|---------|n"
+                parts.append("### Production Dependencies\n\n")
+                parts.append(_PACKAGE_TABLE_HEADER)
                 for name, version in sorted(deps.items())[:20]:
-                    doc += f"| {name} | {version} |\n"
-                doc += "\n"
+                    parts.append(f"| {name} | {version} |\n")
+                parts.append("\n")
 
             if dev_deps:
-                doc += "### Development Dependencies\n\n"
-                doc += "| Package | Version |\n"
-                doc += "|---------|---------|\n"
+                parts.append("### Development Dependencies\n\n")
+                parts.append(_PACKAGE_TABLE_HEADER)
                 for name, version in sorted(dev_deps.items())[:15]:
-                    doc += f"| {name} | {version} |\n"
-                doc += "\n"
+                    parts.append(f"| {name} | {version} |\n")
+                parts.append("\n")
         except Exception:
             pass
 
     # Configuration section
-    doc += "## Configuration\n\n"
-    doc += "### Environment Variables\n\n"
+    parts.append("## Configuration\n\n")
+    parts.append("### Environment Variables\n\n")
 
     env_example = project_dir / '.env.example'
     if env_example.exists():
-        doc += "```bash\n"
-        doc += env_example.read_text()[:2000]
-        doc += "\n```\n\n"
+        parts.append("```bash\n")
+        # Text-mode read(n) stops after n characters, same as slicing the whole file
+        with env_example.open() as f:
+            parts.append(f.read(2000))
+        parts.append("\n```\n\n")
     else:
-        doc += "_No `.env.example` file found. Create one to document required environment variables._\n\n"
+        parts.append("_No `.env.example` file found. Create one to document required environment variables._\n\n")
 
     # Development guide
-    doc += """## Development Guide
+    parts.append("""## Development Guide
 
 ### Getting Started
 
@@ -447,22 +668,21 @@ def generate_technical_documentation(project_dir: Path) -> tuple[str, Path]:
 
 ### Scripts
 
-"""
+""")
 
-    if package_json.exists():
+    if package is not None:
         try:
-            pkg = json.loads(package_json.read_text())
-            scripts = pkg.get('scripts', {})
+            scripts = package.get('scripts', {})
             if scripts:
-                doc += "| Command | Description |\n"
-                doc += "|---------|-------------|\n"
+                parts.append("| Command | Description |\n")
+                parts.append("|---------|-------------|\n")
                 for name, cmd in sorted(scripts.items()):
-                    doc += f"| `npm run {name}` | `{cmd[:50]}` |\n"
-                doc += "\n"
+                    parts.append(f"| `npm run {name}` | `{cmd[:50]}` |\n")
+                parts.append("\n")
         except Exception:
             pass
 
-    doc += """
+    parts.append("""
 ### Code Style
 
 - Follow the existing code patterns
@@ -473,7 +693,8 @@ def generate_technical_documentation(project_dir: Path) -> tuple[str, Path]:
 ---
 
 *This documentation was automatically generated. For more details, refer to the source code and inline comments.*
-"""
+""")
+    doc = ''.join(parts)
 
     # Write to file
     output_path = project_dir / 'TECHNICAL_DOCS.md'
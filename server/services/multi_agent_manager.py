@@ -36,6 +36,20 @@ from registry import (
 
 logger = logging.getLogger(__name__)
 
+# Agent tools that can mark features as passing; the agent prints "[Tool: <name>]"
+# when it calls one, which wakes the completion check
+FEATURE_PASSING_TOOLS = ("feature_mark_passing", "feature_check_parent_completion")
+
+# Completion is still checked this often without a signal
+COMPLETION_CHECK_INTERVAL_SECONDS = 30
+# Delay after a signal so the tool's write lands and bursts are coalesced
+FEATURE_CHANGE_SETTLE_SECONDS = 2
+
+# Agent status updates are merged per agent and written to the registry
+# after this delay, or at once when this many agents have updates pending
+REGISTRY_FLUSH_DELAY_SECONDS = 0.01
+REGISTRY_FLUSH_MAX_PENDING = 100
+
 # Global registry of multi-agent managers
 _multi_managers: dict[str, "MultiAgentManager"] = {}
 _multi_managers_lock = asyncio.Lock()
@@ -56,8 +70,16 @@ class MultiAgentManager:
         self.project_dir = project_dir
         self.agents: dict[str, AgentProcessManager] = {}
         self.feature_locks: dict[int, str] = {}  # feature_id -> agent_id
+        # Inverse of feature_locks (agent_id -> feature_ids), kept in step with it
+        self._agent_features: dict[str, set[int]] = {}
         self._lock = asyncio.Lock()
         self._completion_check_task: Optional[asyncio.Task] = None
+        self._feature_changed = asyncio.Event()
+        # (engine, SessionLocal) for the project's features DB, made on first check
+        self._db: Optional[tuple] = None
+        # Registry updates not yet written: agent_id -> merged fields
+        self._pending_updates: dict[str, dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
         self._output_callbacks: set[Callable[[str], None]] = set()
 
         # Load config
@@ -141,6 +163,23 @@ class MultiAgentManager:
 
             return agent_info
 
+    async def _get_agent(self, agent_id: str) -> AgentProcessManager:
+        """
+        Look up an agent's process manager.
+
+        The lock is only held for the lookup; callers await the manager's
+        start/stop/pause/resume without it, so one agent's lifecycle
+        operation doesn't hold up the others.
+
+        Raises:
+            ValueError: If the agent doesn't exist
+        """
+        async with self._lock:
+            manager = self.agents.get(agent_id)
+        if manager is None:
+            raise ValueError(f"Agent {agent_id} not found")
+        return manager
+
     async def start_agent(
         self,
         agent_id: str,
@@ -158,93 +197,77 @@ class MultiAgentManager:
         Returns:
             Agent status dictionary
         """
-        async with self._lock:
-            if agent_id not in self.agents:
-                raise ValueError(f"Agent {agent_id} not found")
+        manager = await self._get_agent(agent_id)
 
-            manager = self.agents[agent_id]
+        # Register output callback
+        async def output_callback(line: str):
+            if "[Tool: " in line and any(tool in line for tool in FEATURE_PASSING_TOOLS):
+                self.notify_feature_change()
+            self._broadcast_output(agent_id, line)
 
-            # Register output callback
-            async def output_callback(line: str):
-                self._broadcast_output(agent_id, line)
+        manager.add_output_callback(output_callback)
 
-            manager.add_output_callback(output_callback)
+        # Start the agent
+        success, message = await manager.start(yolo_mode=yolo_mode, model=model)
 
-            # Start the agent
-            success, message = await manager.start(yolo_mode=yolo_mode, model=model)
+        if success:
+            # Update registry
+            self._queue_update(
+                agent_id,
+                status="running",
+                pid=manager.pid,
+                started_at=datetime.now()
+            )
+            update_project_last_run(self.project_name)
 
-            if success:
-                # Update registry
-                update_project_agent(
-                    self.project_name,
-                    agent_id,
-                    status="running",
-                    pid=manager.pid,
-                    started_at=datetime.now()
+            # Start completion check if not already running
+            if self.auto_stop_on_completion and not self._completion_check_task:
+                self._completion_check_task = asyncio.create_task(
+                    self._check_completion_loop()
                 )
-                update_project_last_run(self.project_name)
 
-                # Start completion check if not already running
-                if self.auto_stop_on_completion and not self._completion_check_task:
-                    self._completion_check_task = asyncio.create_task(
-                        self._check_completion_loop()
-                    )
-
-            return {
-                "success": success,
-                "status": "running" if success else "stopped",
-                "message": message,
-                "pid": manager.pid if success else None
-            }
+        return {
+            "success": success,
+            "status": "running" if success else "stopped",
+            "message": message,
+            "pid": manager.pid if success else None
+        }
 
     async def stop_agent(self, agent_id: str) -> dict[str, Any]:
         """Stop a specific agent."""
-        async with self._lock:
-            if agent_id not in self.agents:
-                raise ValueError(f"Agent {agent_id} not found")
+        manager = await self._get_agent(agent_id)
+        result = await manager.stop()
 
-            manager = self.agents[agent_id]
-            result = await manager.stop()
+        # Release any locked features
+        self._release_features_for_agent(agent_id)
 
-            # Release any locked features
-            self._release_features_for_agent(agent_id)
+        # Update registry
+        self._queue_update(
+            agent_id,
+            status="stopped",
+            pid=None,
+            current_feature_id=None
+        )
 
-            # Update registry
-            update_project_agent(
-                self.project_name,
-                agent_id,
-                status="stopped",
-                pid=None,
-                current_feature_id=None
-            )
-
-            return result
+        return result
 
     async def pause_agent(self, agent_id: str) -> dict[str, Any]:
         """Pause a specific agent."""
-        async with self._lock:
-            if agent_id not in self.agents:
-                raise ValueError(f"Agent {agent_id} not found")
-
-            manager = self.agents[agent_id]
-            result = await manager.pause()
+        manager = await self._get_agent(agent_id)
+        result = await manager.pause()
 
-            update_project_agent(self.project_name, agent_id, status="paused")
+        self._queue_update(agent_id, status="paused")
 
-            return result
+        return result
 
     async def resume_agent(self, agent_id: str) -> dict[str, Any]:
         """Resume a paused agent."""
-        async with self._lock:
-            if agent_id not in self.agents:
-                raise ValueError(f"Agent {agent_id} not found")
-
-            manager = self.agents[agent_id]
-            result = await manager.resume()
+        manager = await self._get_agent(agent_id)
+        result = await manager.resume()
 
-            update_project_agent(self.project_name, agent_id, status="running")
+        self._queue_update(agent_id, status="running")
 
-            return result
+        return result
 
     async def remove_agent(self, agent_id: str) -> bool:
         """
@@ -252,35 +275,85 @@ class MultiAgentManager:
 
         Stops the agent if running and removes from registry.
         """
+        # Take the agent out under the lock, then stop it without the lock
         async with self._lock:
-            if agent_id in self.agents:
-                manager = self.agents[agent_id]
-                if manager.status in ("running", "paused"):
-                    await manager.stop()
+            manager = self.agents.pop(agent_id, None)
 
-                self._release_features_for_agent(agent_id)
-                del self.agents[agent_id]
+        if manager is not None:
+            if manager.status in ("running", "paused"):
+                await manager.stop()
+            self._release_features_for_agent(agent_id)
 
-            # Remove from registry
-            return delete_project_agent(self.project_name, agent_id)
+        # Remove from registry (with any update still queued for it)
+        self._pending_updates.pop(agent_id, None)
+        return delete_project_agent(self.project_name, agent_id)
 
     async def stop_all(self) -> None:
-        """Stop all agents for this project."""
+        """Stop all agents for this project, concurrently."""
         async with self._lock:
-            for agent_id, manager in list(self.agents.items()):
-                if manager.status in ("running", "paused"):
-                    await manager.stop()
-                    update_project_agent(
-                        self.project_name,
-                        agent_id,
-                        status="stopped",
-                        pid=None
-                    )
-
-            # Cancel completion check
-            if self._completion_check_task:
-                self._completion_check_task.cancel()
-                self._completion_check_task = None
+            targets = [
+                (agent_id, manager) for agent_id, manager in self.agents.items()
+                if manager.status in ("running", "paused")
+            ]
+
+        # Shutdown takes as long as the slowest agent rather than the sum
+        results = await asyncio.gather(
+            *(manager.stop() for _, manager in targets), return_exceptions=True
+        )
+        for (agent_id, _), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.error("Error stopping agent %s: %s", agent_id, result)
+                continue
+            self._queue_update(
+                agent_id,
+                status="stopped",
+                pid=None
+            )
+
+        # Cancel completion check
+        if self._completion_check_task:
+            self._completion_check_task.cancel()
+            self._completion_check_task = None
+
+        if self._db is not None:
+            self._db[0].dispose()
+            self._db = None
+
+        # Write outstanding registry updates now rather than after shutdown
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._flush_updates()
+
+    def _queue_update(self, agent_id: str, **fields: Any) -> None:
+        """
+        Queue a registry update for an agent, merged with any still pending.
+
+        None leaves a field unchanged, as in update_project_agent, so later
+        updates only override the fields they actually set.
+        """
+        pending = self._pending_updates.setdefault(agent_id, {})
+        pending.update((name, value) for name, value in fields.items() if value is not None)
+
+        if len(self._pending_updates) >= REGISTRY_FLUSH_MAX_PENDING:
+            self._flush_updates()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_updates_later())
+
+    async def _flush_updates_later(self) -> None:
+        """Write queued registry updates after REGISTRY_FLUSH_DELAY_SECONDS."""
+        await asyncio.sleep(REGISTRY_FLUSH_DELAY_SECONDS)
+        self._flush_task = None
+        self._flush_updates()
+
+    def _flush_updates(self) -> None:
+        """Write queued registry updates, one update_project_agent call per agent."""
+        pending, self._pending_updates = self._pending_updates, {}
+        for agent_id, fields in pending.items():
+            try:
+                update_project_agent(self.project_name, agent_id, **fields)
+            except Exception as e:
+                logger.error("Error updating agent %s in registry: %s", agent_id, e)
 
     def get_agent_status(self, agent_id: str) -> dict[str, Any]:
         """Get status of a specific agent."""
@@ -318,6 +391,7 @@ class MultiAgentManager:
             if self.feature_locks[feature_id] != agent_id:
                 return False
         self.feature_locks[feature_id] = agent_id
+        self._agent_features.setdefault(agent_id, set()).add(feature_id)
         return True
 
     def unlock_feature(self, feature_id: int, agent_id: str) -> bool:
@@ -329,6 +403,10 @@ class MultiAgentManager:
         if feature_id in self.feature_locks:
             if self.feature_locks[feature_id] == agent_id:
                 del self.feature_locks[feature_id]
+                features = self._agent_features[agent_id]
+                features.discard(feature_id)
+                if not features:
+                    del self._agent_features[agent_id]
                 return True
         return False
 
@@ -338,11 +416,7 @@ class MultiAgentManager:
 
     def _release_features_for_agent(self, agent_id: str) -> None:
         """Release all features locked by an agent."""
-        to_release = [
-            fid for fid, aid in self.feature_locks.items()
-            if aid == agent_id
-        ]
-        for fid in to_release:
+        for fid in self._agent_features.pop(agent_id, ()):
             del self.feature_locks[fid]
 
     def _broadcast_output(self, agent_id: str, line: str) -> None:
@@ -362,15 +436,31 @@ class MultiAgentManager:
         """Unregister an output callback."""
         self._output_callbacks.discard(callback)
 
+    def notify_feature_change(self) -> None:
+        """Signal that features may have changed, so completion is checked soon."""
+        self._feature_changed.set()
+
+    async def _wait_for_feature_change(self) -> None:
+        """Wait for notify_feature_change(), or at most the check interval."""
+        try:
+            await asyncio.wait_for(
+                self._feature_changed.wait(), timeout=COMPLETION_CHECK_INTERVAL_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+        else:
+            await asyncio.sleep(FEATURE_CHANGE_SETTLE_SECONDS)
+        self._feature_changed.clear()
+
     async def _check_completion_loop(self) -> None:
-        """Periodically check if all features are complete."""
-        from api.database import create_database, Feature
+        """Check whether all features are complete when signalled (or periodically)."""
+        from sqlalchemy import func
 
-        check_interval = 30  # seconds
+        from api.database import create_database, Feature
 
         while True:
             try:
-                await asyncio.sleep(check_interval)
+                await self._wait_for_feature_change()
 
                 # Check if any agents are still running
                 running_agents = [
@@ -381,12 +471,16 @@ class MultiAgentManager:
                 if not running_agents:
                     continue
 
-                # Check completion status
-                _, SessionLocal = create_database(self.project_dir)
+                # Check completion status (engine created once, both counts in one query)
+                if self._db is None:
+                    self._db = create_database(self.project_dir)
+                _, SessionLocal = self._db
                 session = SessionLocal()
                 try:
-                    total = session.query(Feature).count()
-                    passing = session.query(Feature).filter(Feature.passes == True).count()
+                    total, passing = session.query(
+                        func.count(Feature.id),
+                        func.count(Feature.id).filter(Feature.passes == True),
+                    ).one()
 
                     if total > 0:
                         percentage = (passing / total) * 100
@@ -10,12 +10,20 @@ import asyncio
 import logging
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Worktrees rebased at once by sync_worktrees (they share one object store)
+SYNC_CONCURRENCY = 4
+
+# Threads per manager for git commands, kept off the default executor so a
+# burst of git work can't starve other blocking calls
+GIT_POOL_WORKERS = 4
+
 
 class WorktreeManager:
     """
@@ -28,6 +36,14 @@ class WorktreeManager:
     def __init__(self, project_dir: Path):
         self.project_dir = project_dir.resolve()
         self.worktrees_base = self.project_dir.parent  # Worktrees go alongside project
+        self._is_git_repo: Optional[bool] = None
+        self._git_pool = ThreadPoolExecutor(
+            max_workers=GIT_POOL_WORKERS, thread_name_prefix="git"
+        )
+
+    def close(self) -> None:
+        """Release the git thread pool (running commands are left to finish)."""
+        self._git_pool.shutdown(wait=False)
 
     def _run_git(self, *args, cwd: Optional[Path] = None) -> tuple[bool, str]:
         """
@@ -50,6 +66,9 @@ class WorktreeManager:
             if result.returncode == 0:
                 return True, result.stdout.strip()
             else:
+                if "not a git repository" in result.stderr:
+                    # Repository was removed behind our back; re-check next time
+                    self._is_git_repo = None
                 return False, result.stderr.strip()
         except subprocess.TimeoutExpired:
             return False, "Command timed out"
@@ -57,9 +76,17 @@ class WorktreeManager:
             return False, str(e)
 
     def is_git_repo(self) -> bool:
-        """Check if the project directory is a git repository."""
-        git_dir = self.project_dir / ".git"
-        return git_dir.exists()
+        """
+        Check if the project directory is a git repository.
+
+        Only a positive result is cached (reset by init_repository() or when a
+        git command reports the directory is no longer a repository); a
+        negative one is re-checked each call, since `git init` may run outside
+        this manager.
+        """
+        if not self._is_git_repo:
+            self._is_git_repo = (self.project_dir / ".git").exists()
+        return self._is_git_repo
 
     async def init_repository(self) -> bool:
         """
@@ -73,18 +100,19 @@ class WorktreeManager:
 
         loop = asyncio.get_event_loop()
         success, output = await loop.run_in_executor(
-            None, lambda: self._run_git("init")
+            self._git_pool, lambda: self._run_git("init")
         )
+        self._is_git_repo = None
 
         if success:
             logger.info("Initialized git repository at %s", self.project_dir)
 
             # Create initial commit
             await loop.run_in_executor(
-                None, lambda: self._run_git("add", "-A")
+                self._git_pool, lambda: self._run_git("add", "-A")
             )
             await loop.run_in_executor(
-                None, lambda: self._run_git("commit", "-m", "Initial commit")
+                self._git_pool, lambda: self._run_git("commit", "-m", "Initial commit")
             )
 
         return success
@@ -122,7 +150,7 @@ class WorktreeManager:
 
         # Create the worktree with a new branch
         success, output = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git(
                 "worktree", "add", "-b", branch,
                 str(worktree_path)
@@ -132,7 +160,7 @@ class WorktreeManager:
         if not success:
             # Try without creating a new branch (branch might exist)
             success, output = await loop.run_in_executor(
-                None,
+                self._git_pool,
                 lambda: self._run_git(
                     "worktree", "add",
                     str(worktree_path), branch
@@ -167,7 +195,7 @@ class WorktreeManager:
 
         # Remove the worktree
         success, output = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("worktree", "remove", str(worktree_path), "--force")
         )
 
@@ -177,7 +205,7 @@ class WorktreeManager:
             # Also delete the branch if it exists
             branch = f"agent/{agent_id}"
             await loop.run_in_executor(
-                None,
+                self._git_pool,
                 lambda: self._run_git("branch", "-D", branch)
             )
 
@@ -189,7 +217,7 @@ class WorktreeManager:
 
                 # Prune worktrees
                 await loop.run_in_executor(
-                    None,
+                    self._git_pool,
                     lambda: self._run_git("worktree", "prune")
                 )
 
@@ -220,7 +248,7 @@ class WorktreeManager:
 
         # Switch to target branch
         success, output = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("checkout", target_branch)
         )
 
@@ -229,7 +257,7 @@ class WorktreeManager:
 
         # Merge the agent branch
         success, output = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("merge", source_branch, "--no-ff", "-m",
                                   f"Merge {source_branch} into {target_branch}")
         )
@@ -240,7 +268,7 @@ class WorktreeManager:
         else:
             # Abort merge on conflict
             await loop.run_in_executor(
-                None,
+                self._git_pool,
                 lambda: self._run_git("merge", "--abort")
             )
             return False, f"Merge conflict: {output}"
@@ -257,7 +285,7 @@ class WorktreeManager:
 
         loop = asyncio.get_event_loop()
         success, output = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("worktree", "list", "--porcelain")
         )
 
@@ -310,47 +338,53 @@ class WorktreeManager:
             List of sync results
         """
         worktrees = await self.list_worktrees()
-        results = []
+        if not worktrees:
+            return []
 
         loop = asyncio.get_event_loop()
 
-        for wt in worktrees:
+        # Fetch latest once: worktrees share the repository's remotes and refs
+        await loop.run_in_executor(
+            self._git_pool,
+            lambda: self._run_git("fetch", "origin")
+        )
+
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+        async def sync_one(wt: dict[str, Any]) -> dict[str, Any]:
             wt_path = Path(wt["path"])
             agent_id = wt.get("agent_id", "unknown")
 
-            # Fetch latest
-            await loop.run_in_executor(
-                None,
-                lambda p=wt_path: self._run_git("fetch", "origin", cwd=p)
-            )
+            async with semaphore:
+                # Rebase on target branch
+                success, output = await loop.run_in_executor(
+                    self._git_pool,
+                    lambda: self._run_git("rebase", f"origin/{target_branch}", cwd=wt_path)
+                )
 
-            # Rebase on target branch
-            success, output = await loop.run_in_executor(
-                None,
-                lambda p=wt_path: self._run_git("rebase", f"origin/{target_branch}", cwd=p)
-            )
+                if not success:
+                    # Abort rebase on conflict
+                    await loop.run_in_executor(
+                        self._git_pool,
+                        lambda: self._run_git("rebase", "--abort", cwd=wt_path)
+                    )
 
             if success:
-                results.append({
+                return {
                     "agent_id": agent_id,
                     "path": str(wt_path),
                     "success": True,
                     "message": "Synced successfully"
-                })
-            else:
-                # Abort rebase on conflict
-                await loop.run_in_executor(
-                    None,
-                    lambda p=wt_path: self._run_git("rebase", "--abort", cwd=p)
-                )
-                results.append({
-                    "agent_id": agent_id,
-                    "path": str(wt_path),
-                    "success": False,
-                    "message": f"Sync failed: {output}"
-                })
+                }
+            return {
+                "agent_id": agent_id,
+                "path": str(wt_path),
+                "success": False,
+                "message": f"Sync failed: {output}"
+            }
 
-        return results
+        # Worktrees are independent, so rebase several at a time
+        return list(await asyncio.gather(*(sync_one(wt) for wt in worktrees)))
 
     async def get_worktree_status(self, agent_id: str) -> Optional[dict[str, Any]]:
         """
@@ -370,19 +404,19 @@ class WorktreeManager:
 
         # Get current branch
         _, branch = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("rev-parse", "--abbrev-ref", "HEAD", cwd=worktree_path)
         )
 
         # Get status
         _, status = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("status", "--porcelain", cwd=worktree_path)
         )
 
         # Get last commit
         _, last_commit = await loop.run_in_executor(
-            None,
+            self._git_pool,
             lambda: self._run_git("log", "-1", "--format=%H %s", cwd=worktree_path)
         )
 
@@ -406,3 +440,10 @@ def get_worktree_manager(project_dir: Path) -> WorktreeManager:
     if key not in _worktree_managers:
         _worktree_managers[key] = WorktreeManager(project_dir)
     return _worktree_managers[key]
+
+
+def remove_worktree_manager(project_dir: Path) -> None:
+    """Forget a project's cached WorktreeManager and release its git pool."""
+    manager = _worktree_managers.pop(str(project_dir.resolve()), None)
+    if manager is not None:
+        manager.close()
@@ -0,0 +1,63 @@
+"""
+Tests for User Authentication
+=============================
+
+Tests login lookups by email or username.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Cheapest bcrypt cost, so hashing in tests stays fast
+os.environ.setdefault("NEXUS_BCRYPT_ROUNDS", "4")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.models.user import Base
+from server.services.auth import authenticate_user, create_user
+
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory user database session."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestAuthenticateUser:
+    """Test login by email or username."""
+
+    def test_login_is_case_insensitive(self, db_session):
+        """Test that a single account matches regardless of case."""
+        create_user(db_session, email="Alice@Example.com", username="Alice", password="password-a")
+
+        assert authenticate_user(db_session, "alice", "password-a").username == "Alice"
+        assert authenticate_user(db_session, "alice@example.com", "password-a").username == "Alice"
+        assert authenticate_user(db_session, "alice", "wrong-password") is None
+
+    def test_case_only_duplicates_prefer_exact_match(self, db_session):
+        """Test that accounts differing only in case can each log in."""
+        create_user(db_session, email="bob1@example.com", username="Bob", password="password-1")
+        create_user(db_session, email="bob2@example.com", username="bob", password="password-2")
+
+        assert authenticate_user(db_session, "Bob", "password-1").email == "bob1@example.com"
+        assert authenticate_user(db_session, "bob", "password-2").email == "bob2@example.com"
+
+    def test_case_only_duplicate_emails_prefer_exact_match(self, db_session):
+        """Test that an exact email match wins over a case-insensitive one."""
+        create_user(db_session, email="Carol@example.com", username="carol1", password="password-1")
+        create_user(db_session, email="carol@example.com", username="carol2", password="password-2")
+
+        assert authenticate_user(db_session, "Carol@example.com", "password-1").username == "carol1"
+        assert authenticate_user(db_session, "carol@example.com", "password-2").username == "carol2"
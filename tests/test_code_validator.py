@@ -0,0 +1,229 @@
+"""
+Tests for the Code Validator's rule prefilters
+==============================================
+
+scan_file only runs a rule on lines that pass its prefilters (the whole-file
+alternation, the RE2 rule sets and each rule's literal needle). These tests
+check that the prefilters never hide a line a plain re.search would flag.
+"""
+
+import dataclasses
+import re
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from server.services import code_validator as cv
+
+# One line per rule that the rule matches, keyed by the rule's pattern.
+# A new rule needs an example here before the tests pass.
+RULE_EXAMPLES = {
+    # Mock data
+    r'\bmockData\b': 'const rows = mockData;',
+    r'\bfakeData\b': 'return fakeData',
+    r'\bsampleData\b': 'load(sampleData)',
+    r'\bdummyData\b': 'let dummyData;',
+    r'\btestData\b(?!\s*=\s*\{)': 'use(testData)',
+    r'\bplaceholderData\b': 'show(placeholderData)',
+    r'\bMOCK_': 'const users = MOCK_USERS',
+    r'\bFAKE_': 'token = FAKE_TOKEN',
+    r'\/\*\s*mock\s*\*\/': 'fn(/* mock */ 1)',
+    r'#\s*mock\s+data': 'x = 1  # mock data below',
+    r'\bgetMockData\b': 'getMockData()',
+    r'\bcreateMockData\b': 'createMockData()',
+    r'\bgenerateFakeData\b': 'generateFakeData()',
+    r'faker\.(name|address|lorem|internet)': 'faker.name()',
+    r'\[\s*["\']Mock\s+Item': "items = ['Mock Item 1']",
+    r'["\']Lorem ipsum': 'text = "Lorem ipsum dolor"',
+    r'["\']John\s+Doe["\']': 'name = "John Doe"',
+    r'["\']Jane\s+Doe["\']': 'name = "Jane Doe"',
+    r'["\']test@test\.com["\']': 'email = "test@test.com"',
+    r'["\']example@example\.com["\']': 'email = "example@example.com"',
+    r'["\']123-?45-?6789["\']': 'ssn = "123-45-6789"',
+    r'["\']555-\d{4}["\']': 'phone = "555-1234"',
+    # Stubs
+    r'//\s*TODO(?!:.*placeholder)': 'save(); // TODO handle errors',
+    r'//\s*FIXME': 'save(); // FIXME later',
+    r'//\s*HACK': 'save(); // HACK around bug',
+    r'//\s*XXX': 'save(); // XXX check this',
+    r'//\s*STUB': 'save(); // STUB',
+    r'#\s*TODO(?!:.*placeholder)': 'save()  # TODO handle errors',
+    r'#\s*FIXME': 'save()  # FIXME later',
+    r'\bpass\s*#\s*stub': '    pass  # stub',
+    r'raise\s+NotImplementedError': '    raise NotImplementedError',
+    r'throw\s+new\s+Error\s*\(\s*["\']Not\s+implemented': 'throw new Error("Not implemented")',
+    r'console\.log\s*\(\s*["\']TODO': 'console.log("TODO: wire up")',
+    r'return\s+null\s*//\s*stub': 'return null // stub',
+    r'return\s+\[\s*\]\s*//\s*stub': 'return [] // stub',
+    r'return\s+\{\s*\}\s*//\s*stub': 'return {} // stub',
+    r'\/\*\s*placeholder\s*\*\/': 'render(/* placeholder */)',
+    r'__placeholder__': 'value = __placeholder__',
+    r'\bTBD\b': 'owner: TBD',
+    r'\bWIP\b': 'status: WIP',
+    # Security
+    r'\.innerHTML\s*=': 'el.innerHTML = html',
+    r'document\.write\s*\(': 'document.write(html)',
+    r'eval\s*\(': 'eval(code)',
+    r'new\s+Function\s*\(': 'const f = new Function(body)',
+    r'\bmd5\s*\(': 'digest = md5(data)',
+    r'\bsha1\s*\(': 'digest = sha1(data)',
+    r'password\s*=\s*["\'][^"\']+["\']': 'password = "hunter22"',
+    r'secret\s*=\s*["\'][^"\']{8,}["\']': 'secret = "s3cr3tvalue"',
+    r'api[_-]?key\s*=\s*["\'][a-zA-Z0-9]{16,}["\']': 'api_key = "abcdefghijklmnop1234"',
+    r'execute\s*\(\s*["\'].*\+': 'cursor.execute("SELECT * FROM t WHERE id=" + id)',
+    r'query\s*\(\s*["\'].*\$\{': 'db.query("SELECT * FROM t WHERE id=${id}")',
+    r'exec\s*\(\s*["\'].*\+': 'exec("ls " + path)',
+    r'subprocess\.call\s*\(\s*["\'].*\+': 'subprocess.call("ls " + path)',
+    r'os\.system\s*\(': 'os.system(cmd)',
+    r'dangerouslySetInnerHTML': '<div dangerouslySetInnerHTML={html} />',
+    r'v-html\s*=': '<div v-html="html"></div>',
+    r'cors\s*\(\s*\{\s*origin\s*:\s*["\']\*["\']': "app.use(cors({ origin: '*' }))",
+    r'Access-Control-Allow-Origin["\']?\s*:\s*["\']?\*': "headers = {'Access-Control-Allow-Origin': '*'}",
+    r'debug\s*=\s*True': 'app.run(debug=True)',
+    r'DEBUG\s*=\s*true': 'DEBUG = true',
+    r'disable.*security': 'disable_web_security()',
+    r'verify\s*=\s*False': 'requests.get(url, verify=False)',
+    r'rejectUnauthorized\s*:\s*false': 'agent({ rejectUnauthorized: false })',
+    r'password.*length.*<\s*[1-7]\b': 'if (password.length < 6) {',
+    r'bcrypt.*rounds.*<\s*10': 'if bcrypt_rounds < 10:',
+    r'jwt\.sign\s*\([^)]*expiresIn\s*:\s*["\']?\d+d': "jwt.sign(payload, key, { expiresIn: '30d' })",
+    r'npm\s+install\s+--no-save': 'npm install --no-save left-pad',
+    r'pip\s+install(?!.*==)': 'pip install requests',
+    r'catch\s*\([^)]*\)\s*\{\s*\}': 'try { f() } catch (e) {}',
+    r'except\s*:\s*pass': 'except: pass',
+    r'fetch\s*\(\s*(?:req\.|request\.)': 'fetch(req.query.url)',
+    r'axios\s*\.\s*get\s*\(\s*(?:req\.|request\.)': 'axios.get(req.body.url)',
+    r'requests\.get\s*\(\s*(?:req\.|request\.)': "requests.get(request.args['url'])",
+    # Legitimate placeholders
+    r'(?:ANTHROPIC|OPENAI|STRIPE|TWILIO|SENDGRID|AWS)_API_KEY\s*[=:]\s*["\'](?:your[_-]?|<|placeholder|xxx)':
+        'ANTHROPIC_API_KEY = "your-key-here"',
+    r'(?:DATABASE|DB|MONGO|POSTGRES|MYSQL)_(?:URL|URI|HOST)\s*[=:]\s*["\'](?:your[_-]?|<|placeholder|localhost)':
+        'DATABASE_URL = "localhost:5432"',
+    r'(?:SECRET|JWT|SESSION)_(?:KEY|SECRET)\s*[=:]\s*["\'](?:your[_-]?|<|change[_-]?me|placeholder)':
+        'SECRET_KEY = "change-me"',
+    r'(?:SMTP|MAIL|EMAIL)_(?:HOST|SERVER|PASSWORD)\s*[=:]\s*["\'](?:your[_-]?|<|placeholder)':
+        'SMTP_HOST = "<smtp host>"',
+    r'(?:OAUTH|AUTH)_(?:CLIENT_ID|CLIENT_SECRET)\s*[=:]\s*["\'](?:your[_-]?|<|placeholder)':
+        'OAUTH_CLIENT_ID = "placeholder"',
+    r'(?:WEBHOOK|CALLBACK)_URL\s*[=:]\s*["\'](?:https?://(?:your|example|placeholder))':
+        'WEBHOOK_URL = "https://example.com/hook"',
+    r'process\.env\.(\w+)': 'const port = process.env.PORT',
+    r'os\.environ(?:\.get)?\s*\(\s*["\'](\w+)["\']': 'port = os.environ.get("PORT")',
+}
+
+# Lines near the rules that must (or must not) be flagged exactly as re.search would
+EXTRA_LINES = [
+    'testData = { id: 1 }',
+    '// TODO: placeholder for the real logo',
+    '# TODO: placeholder',
+    'pip install requests==2.31.0',
+    'password = ""',
+    'api_key = "short"',
+    'const data = MockData.rows',
+    'MOCKDATA.forEach(render)',
+    'EL.INNERHTML = HTML',
+    'café = mockData',
+    'paſſword = "hunter22"',
+    'Disable the Security checks',
+    'nothing to see here',
+]
+
+CATALOGS = [
+    ('mock_data', cv.MOCK_DATA_PATTERNS),
+    ('placeholder', cv.STUB_PATTERNS),
+    ('security', cv.SECURITY_PATTERNS),
+]
+
+
+def _all_rules():
+    return [
+        rule
+        for rules in (cv.MOCK_DATA_PATTERNS, cv.STUB_PATTERNS, cv.SECURITY_PATTERNS,
+                      cv.LEGITIMATE_PLACEHOLDER_PATTERNS)
+        for rule in rules
+    ]
+
+
+def _reference_scan(file_path: Path):
+    """scan_file without prefilters: every rule re.search'd on every line."""
+    issues = []
+    placeholders = []
+    content = file_path.read_text(encoding='utf-8', errors='ignore')
+    for line_num, line in enumerate(content.split('\n'), 1):
+        if not line.strip() or len(line) > 500 or cv.is_in_pattern_definition(line):
+            continue
+        for category, rules in CATALOGS:
+            for rule in rules:
+                if re.search(rule[0], line, re.IGNORECASE):
+                    issues.append((category, line_num, rule[1]))
+        for pattern, placeholder_type, _ in cv.LEGITIMATE_PLACEHOLDER_PATTERNS:
+            if re.search(pattern, line, re.IGNORECASE):
+                placeholders.append((line_num, placeholder_type))
+    return issues, placeholders
+
+
+def _scan(file_path: Path):
+    issues, placeholders = cv.scan_file(file_path)
+    return (
+        [(i.category, i.line_number, i.message) for i in issues],
+        [(p.line_number, p.placeholder_type) for p in placeholders],
+    )
+
+
+@pytest.fixture(params=['default', 'without_re2'])
+def prefilters(request, monkeypatch):
+    """Run with the prefilters as imported, and again with the pure-Python fallbacks."""
+    if request.param == 'without_re2':
+        monkeypatch.setattr(cv, 're2', None)
+        monkeypatch.setattr(cv, '_ANY_RULE_BYTES_RE', cv._compile_bytes_prefilter())
+        for name in ('_MOCK_DATA', '_STUB', '_SECURITY', '_LEGITIMATE_PLACEHOLDER'):
+            monkeypatch.setattr(cv, name, dataclasses.replace(getattr(cv, name), rule_set=None))
+    return request.param
+
+
+class TestRuleExamples:
+    """Each rule's example line keeps the rule's extracted literal anchor."""
+
+    def test_every_rule_has_an_example(self):
+        missing = [rule[0] for rule in _all_rules() if rule[0] not in RULE_EXAMPLES]
+        assert missing == []
+
+    @pytest.mark.parametrize('pattern', sorted(RULE_EXAMPLES))
+    def test_needle_appears_in_example_match(self, pattern):
+        match = re.search(pattern, RULE_EXAMPLES[pattern], re.IGNORECASE)
+        assert match, 'example does not match its rule'
+        assert cv._required_literal(pattern) in match.group(0).lower()
+
+    @pytest.mark.parametrize('pattern', sorted(RULE_EXAMPLES))
+    def test_example_passes_whole_catalog_prefilter(self, pattern):
+        line = RULE_EXAMPLES[pattern]
+        assert cv._ANY_RULE_RE.search(line)
+        assert cv._ANY_RULE_BYTES_RE.search(line.encode('ascii'))
+
+
+class TestScanFileMatchesReference:
+    """scan_file reports exactly what a plain per-rule re.search reports."""
+
+    def _lines(self):
+        lines = list(RULE_EXAMPLES.values()) + EXTRA_LINES
+        return lines + [line.upper() for line in lines] + [line.lower() for line in lines]
+
+    def test_ascii_file(self, tmp_path, prefilters):
+        ascii_lines = [line for line in self._lines() if line.isascii()]
+        path = tmp_path / 'sample.js'
+        path.write_text('\n'.join(ascii_lines), encoding='utf-8')
+        expected = _reference_scan(path)
+        assert expected[0] and expected[1]
+        assert _scan(path) == expected
+
+    def test_decoded_file(self, tmp_path, prefilters):
+        # Non-ASCII bytes and CRLF line endings take the decode-in-full path
+        path = tmp_path / 'sample.py'
+        path.write_bytes('\r\n'.join(self._lines()).encode('utf-8'))
+        expected = _reference_scan(path)
+        assert expected[0] and expected[1]
+        assert _scan(path) == expected
@@ -738,6 +738,9 @@ export const worktreesAPI = {
     fetchJSON(`/projects/${encodeURIComponent(projectName)}/worktrees/init`, {
       method: 'POST',
     }),
+
+  overview: (projectName: string): Promise<{ is_git_repo: boolean; worktrees: WorktreeInfo[]; statuses: Record<string, WorktreeInfo> }> =>
+    fetchJSON(`/projects/${encodeURIComponent(projectName)}/worktrees/overview`),
 }
 
 // ============================================================================